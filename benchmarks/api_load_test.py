@@ -0,0 +1,158 @@
+"""Teste de carga local da API do catálogo (``catalog_server.py``).
+
+Sobe o servidor num processo separado (ou usa ``--url`` de um já rodando) e
+simula tablets consultando o índice, receitas e a busca por ingredientes,
+reenviando o ETag recebido como um tablet faria. Imprime requisições por
+segundo, a latência p50/p99 e quantas respostas cada tablet recebeu (com
+``--interval``, todos devem ser atendidos mesmo com mais tablets que threads).
+
+    python benchmarks/api_load_test.py --clients 16 --duration 10
+    python benchmarks/api_load_test.py --clients 20 --interval 1 --duration 8
+    python benchmarks/api_load_test.py --size 10000 --no-etag
+"""
+import argparse
+import http.client
+import json
+import os
+import random
+import socket
+import statistics
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+from collections import Counter
+from urllib.parse import quote, urlsplit
+
+BASE_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, BASE_DIR)
+from catalog_store import FIELDS  # noqa: E402
+from synthetic import synthetic_records  # noqa: E402
+
+SEARCHES = ("gin", "gin,limão", "rum branco", "vodka", "cachaça,limão")
+
+
+def free_port():
+    with socket.socket() as s:
+        s.bind(("127.0.0.1", 0))
+        return s.getsockname()[1]
+
+
+def start_server(catalog, port):
+    process = subprocess.Popen([sys.executable, os.path.join(BASE_DIR, "catalog_server.py"),
+                                catalog, "--host", "127.0.0.1", "--port", str(port)],
+                               stdout=subprocess.DEVNULL)
+    deadline = time.time() + 30
+    while time.time() < deadline:
+        try:
+            socket.create_connection(("127.0.0.1", port), timeout=0.2).close()
+            return process
+        except OSError:
+            time.sleep(0.1)
+    process.kill()
+    sys.exit("O servidor não subiu a tempo")
+
+
+def client(host, port, paths, use_etag, interval, stop, results, seed):
+    rng = random.Random(seed)
+    etags = {}
+    latencies = []
+    statuses = Counter()
+    connection = http.client.HTTPConnection(host, port, timeout=10)
+    while not stop.is_set():
+        path = rng.choice(paths)
+        headers = {"Accept-Encoding": "gzip"}
+        if use_etag and path in etags:
+            headers["If-None-Match"] = etags[path]
+        start = time.perf_counter()
+        try:
+            connection.request("GET", path, headers=headers)
+            response = connection.getresponse()
+            response.read()
+        except (OSError, http.client.HTTPException):
+            statuses["erro"] += 1
+            connection.close()
+            connection = http.client.HTTPConnection(host, port, timeout=10)
+            continue
+        latencies.append(time.perf_counter() - start)
+        statuses[response.status] += 1
+        if response.getheader("ETag"):
+            etags[path] = response.getheader("ETag")
+        if interval:
+            stop.wait(interval)
+    connection.close()
+    results.append((latencies, statuses))
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Teste de carga da API do catálogo")
+    parser.add_argument("--url", help="API já rodando (ex.: http://127.0.0.1:8080)")
+    parser.add_argument("--catalog", default=os.path.join(BASE_DIR, "drinks.jsonl"))
+    parser.add_argument("--size", type=int, help="usa um catálogo sintético com N receitas")
+    parser.add_argument("--clients", type=int, default=16, help="tablets simultâneos")
+    parser.add_argument("--duration", type=float, default=10, help="segundos de teste")
+    parser.add_argument("--no-etag", action="store_true", help="não reenvia o ETag (sempre 200)")
+    parser.add_argument("--interval", type=float, default=0,
+                        help="segundos entre as consultas de cada tablet (padrão: sem pausa)")
+    args = parser.parse_args()
+
+    process = None
+    with tempfile.TemporaryDirectory() as directory:
+        catalog = args.catalog
+        count = None
+        if args.size:
+            catalog = os.path.join(directory, "catalog.jsonl")
+            with open(catalog, "w", encoding="utf-8") as f:
+                for record in synthetic_records(args.size):
+                    f.write(json.dumps({field: record[field] for field in FIELDS},
+                                       ensure_ascii=False) + "\n")
+            count = args.size
+        if args.url:
+            url = urlsplit(args.url)
+            host, port = url.hostname, url.port or 80
+        else:
+            host, port = "127.0.0.1", free_port()
+            process = start_server(catalog, port)
+
+        try:
+            if count is None:
+                connection = http.client.HTTPConnection(host, port, timeout=10)
+                connection.request("GET", "/drinks")
+                count = len(json.loads(connection.getresponse().read()))
+                connection.close()
+            paths = ["/drinks"] * 2 + [f"/drinks/{i}" for i in random.Random(0).sample(
+                range(count), min(count, 50))]
+            paths += [f"/ingredients?q={quote(search)}" for search in SEARCHES]
+
+            stop = threading.Event()
+            results = []
+            threads = [threading.Thread(target=client, args=(host, port, paths, not args.no_etag,
+                                                             args.interval, stop, results, seed))
+                       for seed in range(args.clients)]
+            start = time.perf_counter()
+            for thread in threads:
+                thread.start()
+            time.sleep(args.duration)
+            stop.set()
+            for thread in threads:
+                thread.join()
+            elapsed = time.perf_counter() - start
+        finally:
+            if process is not None:
+                process.terminate()
+                process.wait()
+
+    latencies = sorted(latency for thread_latencies, _ in results for latency in thread_latencies)
+    statuses = sum((thread_statuses for _, thread_statuses in results), Counter())
+    print(f"{count} receitas, {args.clients} clientes, {elapsed:.1f} s")
+    print(f"requisições: {len(latencies)} ({len(latencies) / elapsed:.0f}/s)")
+    print("respostas: " + ", ".join(f"{status}: {n}" for status, n in sorted(statuses.items(), key=str)))
+    print("respostas por tablet: " + str(sorted(sum(s.values()) - s["erro"] for _, s in results)))
+    if latencies:
+        print(f"latência p50 {statistics.median(latencies) * 1000:.2f} ms, "
+              f"p99 {latencies[int(0.99 * (len(latencies) - 1))] * 1000:.2f} ms")
+
+
+if __name__ == "__main__":
+    main()
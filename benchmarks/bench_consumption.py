@@ -0,0 +1,67 @@
+"""Fechamento com 100k pedidos: cálculo em lote (NumPy) × laço por pedido.
+
+Uso: ``python benchmarks/bench_consumption.py [pedidos] [receitas]``
+"""
+import os
+import random
+import sys
+import time
+from collections import defaultdict
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from consumption import UNIT_ML, ConsumptionEngine  # noqa: E402
+from ingredients import normalize, parse_ingredients  # noqa: E402
+from synthetic import synthetic_records  # noqa: E402
+
+
+def naive_consumption(records, names):
+    """Referência: percorre os pedidos um a um somando os ml de cada ingrediente"""
+    by_name = {normalize(record["name"]): record for record in records}
+    totals = defaultdict(float)
+    for name in names:
+        record = by_name.get(normalize(name))
+        if record is None:
+            continue
+        measured = 0.0
+        unmeasured = []
+        for item in parse_ingredients(record["ingredients"]):
+            if item.quantity is not None and item.unit in UNIT_ML:
+                volume = item.quantity * UNIT_ML[item.unit]
+                totals[normalize(item.name)] += volume
+                measured += volume
+            elif item.quantity is None:
+                unmeasured.append(normalize(item.name))
+        if len(unmeasured) == 1 and record["ml"] > measured:  # Mesma regra do "complete com"
+            totals[unmeasured[0]] += record["ml"] - measured
+    return totals
+
+
+def main():
+    orders = int(sys.argv[1]) if len(sys.argv) > 1 else 100_000
+    recipes = int(sys.argv[2]) if len(sys.argv) > 2 else 1_000
+    records = synthetic_records(recipes)
+    rng = random.Random(7)
+    names = [rng.choice(records)["name"] for _ in range(orders)]
+    
+    start = time.perf_counter()
+    engine = ConsumptionEngine(records)
+    build = time.perf_counter() - start
+    
+    start = time.perf_counter()
+    report = engine.compute(names)
+    batched = time.perf_counter() - start
+    
+    start = time.perf_counter()
+    naive = naive_consumption(records, names)
+    loop = time.perf_counter() - start
+    
+    batched_total = sum(item.ml for item in report.usage)
+    print(f"{recipes} receitas, {len(engine.ingredients)} ingredientes, {orders} pedidos")
+    print(f"matriz montada      {build * 1000:9.1f} ms")
+    print(f"cálculo em lote     {batched * 1000:9.1f} ms")
+    print(f"laço por pedido     {loop * 1000:9.1f} ms   ({loop / batched:.0f}x mais lento)")
+    print(f"total de ml conferido: {batched_total:.0f} (lote) × {sum(naive.values()):.0f} (laço)")
+
+
+if __name__ == "__main__":
+    main()
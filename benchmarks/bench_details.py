@@ -0,0 +1,96 @@
+"""Latência clique → renderização do painel de detalhes.
+
+Compara a estratégia antiga (destruir e recriar frames/labels a cada clique)
+com o pool reconfigurável de ``DrinkApp.show_drink_details``. Precisa de um
+display (use ``xvfb-run python benchmarks/bench_details.py`` em servidores).
+"""
+import os
+import statistics
+import sys
+import time
+
+import customtkinter as ctk
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from oguru_app import DrinkApp  # noqa: E402
+
+CLICKS = 200
+
+
+def legacy_show_drink_details(app, drink, frames):
+    """Cópia da implementação anterior ao pool, usada como referência.
+
+    Só destrói os frames que ela mesma criou (guardados em ``frames``): os
+    widgets do pool, como ``app.detail_photo``, continuam sendo do app.
+    """
+    while frames:
+        frames.pop().destroy()
+    app.content_title.configure(text=drink["name"])
+    details = [
+        ("🍹 Copo", drink["glass"]),
+        ("🧊 Volume", f"{drink['ml']}ml"),
+        ("🌿 Ingredientes", drink["ingredients"]),
+        ("👨‍🍳 Modo de Preparo", drink["instructions"]),
+        ("🍒 Guarnição", drink["garnish"]),
+        ("👅 Sabor", drink["flavor"]),
+        ("👀 Aparência", drink["appearance"])
+    ]
+    for icon, text in details:
+        frame = ctk.CTkFrame(app.drink_details, fg_color="transparent")
+        frame.pack(fill="x", pady=5)
+        frames.append(frame)
+        label = ctk.CTkLabel(
+            frame,
+            text=icon + " " + text.split("\n")[0],
+            font=app.subtitle_font if "\n" not in text else app.normal_font,
+            text_color=app.accent_color if "\n" not in text else app.text_color,
+            anchor="w"
+        )
+        label.pack(fill="x")
+        if "\n" in text:
+            for line in text.split("\n")[1:]:
+                ctk.CTkLabel(frame, text=line, font=app.normal_font,
+                             text_color=app.text_color, anchor="w").pack(fill="x")
+
+
+def measure(root, render, drinks):
+    timings = []
+    for i in range(CLICKS):
+        drink = drinks[i % len(drinks)]
+        start = time.perf_counter()
+        render(drink)
+        root.update_idletasks()  # Inclui o layout/desenho pendente do clique
+        timings.append((time.perf_counter() - start) * 1000)
+    return timings
+
+
+def report(label, timings):
+    timings = sorted(timings)
+    p95 = timings[int(len(timings) * 0.95) - 1]
+    print(f"{label:<10} média {statistics.mean(timings):7.2f} ms   "
+          f"p50 {statistics.median(timings):7.2f} ms   p95 {p95:7.2f} ms")
+
+
+def main():
+    root = ctk.CTk()
+    app = DrinkApp(root, min_splash_ms=0)
+    while app.time_to_interactive_ms is None:  # Espera a interface principal
+        root.update()
+    
+    records = [app.catalog.get(d["id"]) for d in app.drinks]
+    legacy_frames = []
+    app._clear_drink_details()
+    before = measure(root, lambda d: legacy_show_drink_details(app, d, legacy_frames), records)
+    # Limpar só o que a versão antiga deixou antes de medir o pool
+    while legacy_frames:
+        legacy_frames.pop().destroy()
+    after = measure(root, app.show_drink_details, app.drinks)  # Inclui a busca no catálogo
+    
+    print(f"{CLICKS} cliques percorrendo {len(app.drinks)} drinks")
+    report("antes", before)
+    report("depois", after)
+    root.destroy()
+
+
+if __name__ == "__main__":
+    main()
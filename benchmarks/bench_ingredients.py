@@ -0,0 +1,44 @@
+"""Consultas do índice de ingredientes em um catálogo sintético de 10k receitas.
+
+Uso: ``python benchmarks/bench_ingredients.py [quantidade]``
+"""
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from ingredients import IngredientIndex  # noqa: E402
+from synthetic import synthetic_records  # noqa: E402
+
+REPEAT = 1000
+
+QUERIES = [
+    ("contém gin + limão", "containing", ["gin", "limão"]),
+    ("contém rum branco", "containing", ["rum branco"]),
+    ("prateleira (6 itens)", "makeable_from",
+     ["gin", "vermute doce", "campari", "limão", "xarope simples", "água com gás"]),
+]
+
+
+def main():
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 10_000
+    records = synthetic_records(count)
+    
+    start = time.perf_counter()
+    index = IngredientIndex.from_records(records)
+    build = time.perf_counter() - start
+    print(f"{count} receitas, {len(index.ingredients())} ingredientes distintos, "
+          f"índice montado em {build * 1000:.0f} ms")
+    
+    for label, method, terms in QUERIES:
+        query = getattr(index, method)
+        result = query(terms)
+        start = time.perf_counter()
+        for _ in range(REPEAT):
+            query(terms)
+        elapsed = (time.perf_counter() - start) / REPEAT
+        print(f"{label:<24} {len(result):6} receitas   {elapsed * 1e6:8.1f} µs/consulta")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,84 @@
+"""Memória e filtros de copo/sabor/volume em um catálogo sintético de 100k receitas.
+
+Compara os registros completos em memória (um dicionário por receita, como
+lidos do JSON) com as colunas compactas do ``FacetIndex`` e com o índice leve
+da lista, e mede o mesmo filtro feito por varredura e pelos bitmaps.
+
+Uso: ``python benchmarks/bench_memory.py [quantidade]``
+"""
+import gc
+import json
+import os
+import sys
+import tempfile
+import time
+import tracemalloc
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from catalog_store import FIELDS  # noqa: E402
+from drink_model import DrinkCatalog  # noqa: E402
+from facets import FacetIndex  # noqa: E402
+from ingredients import normalize  # noqa: E402
+from synthetic import synthetic_records  # noqa: E402
+
+REPEAT = 200
+GLASS, FLAVOR, MAX_ML = "old-fashioned", "citrico", 120
+
+
+def measured(build):
+    """Resultado de ``build`` e a memória que ele mantém alocada (bytes)"""
+    gc.collect()
+    tracemalloc.start()
+    before = tracemalloc.get_traced_memory()[0]
+    result = build()
+    gc.collect()
+    after = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    return result, after - before
+
+
+def scan(records):
+    """O mesmo filtro dos chips, percorrendo os dicionários"""
+    return [record["id"] for record in records
+            if GLASS in normalize(record["glass"])
+            and any(word.startswith(FLAVOR) for word in normalize(record["flavor"]).split())
+            and float(record["ml"]) <= MAX_ML]
+
+
+def timed(function):
+    start = time.perf_counter()
+    for _ in range(REPEAT):
+        function()
+    return (time.perf_counter() - start) / REPEAT
+
+
+def main():
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 100_000
+    with tempfile.TemporaryDirectory() as directory:
+        path = os.path.join(directory, "catalog.jsonl")
+        with open(path, "w", encoding="utf-8") as f:
+            for record in synthetic_records(count):
+                f.write(json.dumps({field: record[field] for field in FIELDS}, ensure_ascii=False) + "\n")
+
+        def load_records():
+            with open(path, encoding="utf-8") as f:
+                return [dict(json.loads(line), id=i) for i, line in enumerate(f)]
+
+        records, records_bytes = measured(load_records)
+        facets, facets_bytes = measured(lambda: FacetIndex.from_records(records))
+        catalog, catalog_bytes = measured(lambda: DrinkCatalog(path).load())
+
+    print(f"{count} receitas")
+    print(f"{'registros completos (dicts)':<32} {records_bytes / 1024 / 1024:8.1f} MB")
+    print(f"{'colunas de filtro (FacetIndex)':<32} {facets_bytes / 1024 / 1024:8.1f} MB")
+    print(f"{'índice da lista (id e nome)':<32} {catalog_bytes / 1024 / 1024:8.1f} MB")
+
+    expected = sorted(scan(records))
+    assert sorted(facets.filter(GLASS, FLAVOR, MAX_ML)) == expected
+    print(f"filtro copo + sabor + volume: {len(expected)} receitas")
+    print(f"{'varredura dos dicts':<32} {timed(lambda: scan(records)) * 1e3:8.2f} ms")
+    print(f"{'bitmaps':<32} {timed(lambda: facets.filter(GLASS, FLAVOR, MAX_ML)) * 1e6:8.1f} µs")
+
+
+if __name__ == "__main__":
+    main()
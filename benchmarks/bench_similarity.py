@@ -0,0 +1,49 @@
+"""Tabela de drinks parecidos em um catálogo sintético de 10k receitas.
+
+Mede a montagem completa, a consulta feita a cada clique e as atualizações
+incrementais (inclusão, alteração e remoção de uma receita).
+
+Uso: ``python benchmarks/bench_similarity.py [quantidade]``
+"""
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from similarity import SimilarityIndex  # noqa: E402
+from synthetic import synthetic_records  # noqa: E402
+
+REPEAT = 1000
+UPDATES = 20
+
+
+def main():
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 10_000
+    records = synthetic_records(count)
+
+    start = time.perf_counter()
+    index = SimilarityIndex(records)
+    build = time.perf_counter() - start
+    print(f"{count} receitas, tabela montada em {build * 1000:.0f} ms")
+
+    start = time.perf_counter()
+    for i in range(REPEAT):
+        index.similar(records[i % count]["id"], 4)
+    print(f"{'consulta':<24} {(time.perf_counter() - start) / REPEAT * 1e6:8.1f} µs")
+
+    step = max(1, count // UPDATES)
+    operations = [
+        ("inclusão", lambda i: index.add(count + i, records[(i * step) % count])),
+        ("alteração", lambda i: index.add(records[(i * step) % count]["id"],
+                                           records[(i * step + 1) % count])),
+        ("remoção", lambda i: index.remove(records[(i * step) % count]["id"])),
+    ]
+    for label, operation in operations:
+        start = time.perf_counter()
+        for i in range(UPDATES):
+            operation(i)
+        print(f"{label:<24} {(time.perf_counter() - start) / UPDATES * 1000:8.1f} ms")
+
+
+if __name__ == "__main__":
+    main()
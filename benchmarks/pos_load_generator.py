@@ -0,0 +1,150 @@
+"""Simulador de PDV: envia pedidos ao app em ritmo constante.
+
+Com o app rodando em ``python oguru_app.py --orders-port 5055``:
+
+    python benchmarks/pos_load_generator.py --rate 600 --duration 60
+
+envia 600 pedidos por minuto durante um minuto pelo socket; com
+``--spool PASTA`` grava arquivos ``.orders`` na pasta em vez disso (app
+com ``--orders-spool PASTA``). O ritmo alcançado é impresso ao final.
+
+Com ``--app`` o próprio gerador abre o app com ``--instrument`` e, ao final,
+lê o log para mostrar o atraso do loop do Tk enquanto os pedidos chegavam
+(p50/p99 dos heartbeats). Precisa de display; em servidores:
+
+    xvfb-run python benchmarks/pos_load_generator.py --app --rate 600 --duration 60
+"""
+import argparse
+import glob
+import json
+import os
+import random
+import socket
+import subprocess
+import sys
+import tempfile
+import time
+
+BENCH_DIR = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, BENCH_DIR)
+from synthetic import base_records  # noqa: E402
+
+SAMPLE_S = 1.0      # intervalo das amostras de ``instrumentation.Instrumentation``
+STARTUP_S = 60      # espera máxima pelo app aberto com ``--app``
+
+
+def order_lines(names, rng):
+    while True:
+        yield json.dumps({
+            "name": rng.choice(names),
+            "table": rng.randint(1, 30),
+            "quantity": rng.choice((1, 1, 1, 2, 3)),
+        }, ensure_ascii=False) + "\n"
+
+
+def percentile(values, fraction):
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(fraction * len(ordered)))] if ordered else 0.0
+
+
+def start_app(args, log_path):
+    """Abre o app instrumentado e espera a interface e a entrada de pedidos"""
+    command = [sys.executable, os.path.join(os.path.dirname(BENCH_DIR), "oguru_app.py"),
+               "--splash-ms", "0", "--no-watch", "--instrument", log_path]
+    command += ["--orders-spool", args.spool] if args.spool else ["--orders-port", str(args.port)]
+    process = subprocess.Popen(command)
+    deadline = time.monotonic() + STARTUP_S
+    while time.monotonic() < deadline:
+        if process.poll() is not None:
+            sys.exit(f"O app terminou ao abrir (código {process.returncode})")
+        ready = os.path.exists(log_path) and '"setup_main_interface"' in open(log_path).read()
+        if ready and not args.spool:
+            try:
+                socket.create_connection(("127.0.0.1", args.port), timeout=1).close()
+            except OSError:
+                ready = False
+        if ready:
+            return process
+        time.sleep(0.2)
+    process.terminate()
+    sys.exit(f"O app não ficou pronto em {STARTUP_S} s")
+
+
+def loop_lag(log_path, start, end):
+    """Atrasos do loop do Tk (ms) registrados entre ``start`` e ``end`` (``time.time()``)"""
+    lags = []
+    # O log pode ter girado durante o envio: lê os arquivos antigos primeiro
+    for path in sorted(glob.glob(log_path + "*"), reverse=True):
+        with open(path, encoding="utf-8") as f:
+            for line in f:
+                record = json.loads(line)
+                # Cada amostra traz os heartbeats do segundo anterior
+                if record.get("event") == "sample" and start < record["t"] <= end + SAMPLE_S:
+                    lags.extend(record["lags_ms"])
+    return lags
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--port", type=int, default=5055)
+    parser.add_argument("--spool", help="pasta de spool (em vez do socket)")
+    parser.add_argument("--rate", type=float, default=600, help="pedidos por minuto")
+    parser.add_argument("--duration", type=float, default=60, help="segundos de envio")
+    parser.add_argument("--batch", type=int, default=10,
+                        help="pedidos por arquivo no modo spool")
+    parser.add_argument("--app", action="store_true",
+                        help="abre o app instrumentado e mede o atraso do loop do Tk")
+    args = parser.parse_args()
+    
+    rng = random.Random(1)
+    lines = order_lines([record["name"] for record in base_records()], rng)
+    interval = 60.0 / args.rate
+    total = int(args.rate * args.duration / 60)
+    
+    app = None
+    if args.app:
+        log_path = os.path.join(tempfile.mkdtemp(prefix="oguru-pos-"), "metrics.jsonl")
+        app = start_app(args, log_path)
+    
+    wall_start = time.time()
+    connection = None if args.spool else socket.create_connection(("127.0.0.1", args.port))
+    start = time.perf_counter()
+    pending = []
+    for sent in range(1, total + 1):
+        line = next(lines)
+        if connection is not None:
+            connection.sendall(line.encode("utf-8"))
+        else:
+            pending.append(line)
+            if len(pending) >= args.batch or sent == total:
+                # Grava com outra extensão e renomeia: o app nunca lê arquivo pela metade
+                path = os.path.join(args.spool, f"{time.time_ns()}-{sent}")
+                with open(path + ".tmp", "w", encoding="utf-8") as f:
+                    f.writelines(pending)
+                os.replace(path + ".tmp", path + ".orders")
+                pending = []
+        # Ritmo constante, sem acumular atraso
+        delay = start + sent * interval - time.perf_counter()
+        if delay > 0:
+            time.sleep(delay)
+    
+    elapsed = time.perf_counter() - start
+    if connection is not None:
+        connection.close()
+    print(f"{total} pedidos em {elapsed:.1f} s ({total / elapsed * 60:.0f} pedidos/min)")
+    
+    if app is not None:
+        wall_end = time.time()
+        time.sleep(SAMPLE_S * 2)  # Deixa o app gravar a amostra com os últimos heartbeats
+        app.terminate()
+        app.wait()
+        lags = loop_lag(log_path, wall_start, wall_end)
+        if not lags:
+            sys.exit("Nenhuma amostra do loop no log do app")
+        print(f"atraso do loop do Tk: p50 {percentile(lags, 0.5):.1f} ms   "
+              f"p99 {percentile(lags, 0.99):.1f} ms   máx {max(lags):.1f} ms "
+              f"({len(lags)} heartbeats)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,196 @@
+"""Suíte de benchmarks para comparar versões do app.
+
+Para cada tamanho de catálogo sintético (20, 1k, 10k e 100k receitas por
+padrão) mede a carga do catálogo (JSONL e SQLite), a formatação dos
+detalhes, buscas e, com display, a montagem da lista lateral e a
+renderização do painel de detalhes. Sem ``DISPLAY``, as medições de widgets
+rodam sob ``xvfb-run`` quando disponível.
+
+    python benchmarks/run_benchmarks.py --output resultados.json
+    python benchmarks/run_benchmarks.py --compare resultados-v1.json
+
+Com ``--compare`` o script sai com código 1 se alguma métrica piorar além
+de ``--threshold`` (25% por padrão).
+"""
+import argparse
+import json
+import os
+import platform
+import shutil
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+
+BASE_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, BASE_DIR)
+from catalog_store import FIELDS, SQLiteCatalogStore  # noqa: E402
+from drink_model import DrinkCatalog, format_drink_details  # noqa: E402
+from ingredients import IngredientIndex  # noqa: E402
+from synthetic import synthetic_records  # noqa: E402
+
+DEFAULT_SIZES = (20, 1_000, 10_000, 100_000)
+SAMPLES = 200
+QUERIES = ("negroni", "pina col", "marg", "espreso martni", "old f")
+
+
+def timed(function, repeat=1):
+    """Mediana em ms de ``repeat`` execuções"""
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        function()
+        timings.append((time.perf_counter() - start) * 1000)
+    return statistics.median(timings)
+
+
+def write_catalogs(size, directory):
+    records = synthetic_records(size)
+    jsonl_path = os.path.join(directory, f"catalog-{size}.jsonl")
+    with open(jsonl_path, "w", encoding="utf-8") as f:
+        for record in records:
+            f.write(json.dumps({field: record[field] for field in FIELDS}, ensure_ascii=False) + "\n")
+    sqlite_path = os.path.join(directory, f"catalog-{size}.db")
+    store = SQLiteCatalogStore(sqlite_path)
+    store.write_records(records)
+    store.close()
+    return jsonl_path, sqlite_path
+
+
+def model_benchmarks(jsonl_path, sqlite_path):
+    results = {}
+    repeat = 3 if os.path.getsize(jsonl_path) > 10_000_000 else 5
+    for label, path in (("jsonl", jsonl_path), ("sqlite", sqlite_path)):
+        results[f"catalog_load_{label}_ms"] = timed(lambda: DrinkCatalog(path).load(), repeat)
+
+    catalog = DrinkCatalog(jsonl_path)
+    catalog.load()
+    ids = [catalog.drinks[i * len(catalog.drinks) // SAMPLES]["id"]
+           for i in range(min(SAMPLES, len(catalog.drinks)))]
+    results["detail_fetch_ms"] = timed(lambda: [catalog.get(drink_id) for drink_id in ids]) / len(ids)
+    records = [catalog.get(drink_id) for drink_id in ids]
+    results["detail_format_ms"] = timed(lambda: [format_drink_details(r) for r in records]) / len(ids)
+    names = [record["name"] for record in records]
+    results["lookup_ms"] = timed(lambda: [catalog.find(name) for name in names]) / len(names)
+    results["search_ms"] = timed(lambda: [catalog.search_index.search(q) for q in QUERIES], 5) / len(QUERIES)
+    results["ingredient_index_build_ms"] = timed(
+        lambda: IngredientIndex.from_records(catalog.iter_records()), repeat)
+    catalog.close()
+    return results
+
+
+def widget_benchmarks(path):
+    """Roda num processo separado (com display) e imprime o resultado em JSON"""
+    import customtkinter as ctk
+    from oguru_app import DrinkApp
+
+    root = ctk.CTk()
+    app = DrinkApp(root, path, min_splash_ms=0)
+    while app.time_to_interactive_ms is None:
+        root.update()
+    results = {"time_to_interactive_ms": app.time_to_interactive_ms}
+
+    # Lista lateral do zero: descarta o pool para medir também a criação dos botões
+    for button in app.list_buttons:
+        button.destroy()
+    app.list_buttons = []
+
+    def build_list():
+        app.show_drink_list()
+        root.update_idletasks()
+    results["sidebar_build_ms"] = timed(build_list)
+
+    def scroll_list():
+        for step in range(50):
+            app._scroll_list_to(step * len(app.drinks) // 50)
+            root.update_idletasks()
+    results["sidebar_scroll_ms"] = timed(scroll_list) / 50
+
+    drinks = [app.drinks[i * len(app.drinks) // SAMPLES] for i in range(min(SAMPLES, len(app.drinks)))]
+    def render_details():
+        for drink in drinks:
+            app.show_drink_details(drink)
+            root.update_idletasks()
+    results["detail_render_ms"] = timed(render_details) / len(drinks)
+    root.destroy()
+    print(json.dumps(results))
+
+
+def run_widget_process(path):
+    command = [sys.executable, os.path.abspath(__file__), "--widget-worker", path]
+    if not os.environ.get("DISPLAY") and sys.platform.startswith("linux"):
+        if shutil.which("xvfb-run") is None:
+            return {"skipped": "sem DISPLAY e sem xvfb-run"}
+        command = ["xvfb-run", "-a"] + command
+    completed = subprocess.run(command, capture_output=True, text=True)
+    if completed.returncode != 0:
+        return {"skipped": completed.stderr.strip().splitlines()[-1:] or "falhou"}
+    return json.loads(completed.stdout.strip().splitlines()[-1])
+
+
+def compare(results, previous, threshold):
+    """Lista as métricas que pioraram mais que ``threshold`` em relação a ``previous``"""
+    regressions = []
+    for size, metrics in results["results"].items():
+        old_metrics = previous.get("results", {}).get(size, {})
+        for name, value in metrics.items():
+            old = old_metrics.get(name)
+            if isinstance(value, (int, float)) and isinstance(old, (int, float)) and old > 0:
+                change = value / old - 1
+                if change > threshold:
+                    regressions.append(f"{size:>7} {name:<28} {old:10.3f} → {value:10.3f} ms (+{change:.0%})")
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmarks do Oguru App")
+    parser.add_argument("--sizes", default=",".join(map(str, DEFAULT_SIZES)),
+                        help="tamanhos dos catálogos sintéticos, separados por vírgula")
+    parser.add_argument("--output", default="benchmark-results.json")
+    parser.add_argument("--no-widgets", action="store_true", help="só a camada de dados")
+    parser.add_argument("--compare", help="resultado anterior para detectar regressões")
+    parser.add_argument("--threshold", type=float, default=0.25)
+    parser.add_argument("--widget-worker", help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.widget_worker:
+        widget_benchmarks(args.widget_worker)
+        return
+
+    results = {
+        "meta": {
+            "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S"),
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+        },
+        "results": {},
+    }
+    with tempfile.TemporaryDirectory() as directory:
+        for size in (int(s) for s in args.sizes.split(",")):
+            jsonl_path, sqlite_path = write_catalogs(size, directory)
+            metrics = model_benchmarks(jsonl_path, sqlite_path)
+            if not args.no_widgets:
+                metrics.update(run_widget_process(jsonl_path))
+            results["results"][str(size)] = metrics
+            print(f"{size:>7} receitas")
+            for name, value in metrics.items():
+                shown = f"{value:10.3f} ms" if isinstance(value, (int, float)) else value
+                print(f"        {name:<28} {shown}")
+
+    with open(args.output, "w", encoding="utf-8") as f:
+        json.dump(results, f, indent=2, ensure_ascii=False)
+    print(f"Resultados gravados em {args.output}")
+
+    if args.compare:
+        with open(args.compare, encoding="utf-8") as f:
+            regressions = compare(results, json.load(f), args.threshold)
+        if regressions:
+            print("Regressões:")
+            print("\n".join(regressions))
+            sys.exit(1)
+        print("Nenhuma regressão acima do limite")
+
+
+if __name__ == "__main__":
+    main()
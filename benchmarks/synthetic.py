@@ -0,0 +1,37 @@
+"""Catálogos sintéticos para os benchmarks, derivados de ``drinks.jsonl``.
+
+Os nomes recebem um número de série e os ingredientes são sorteados de um
+conjunto maior (variações das bebidas base), para que os índices tenham uma
+distribuição parecida com a de um catálogo real grande.
+"""
+import json
+import os
+import random
+
+BASE_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+_VARIANTS = ["", " envelhecido", " defumado", " de frutas vermelhas", " artesanal",
+             " de maracujá", " cítrico", " especiado", " de pêssego", " premium"]
+
+
+def base_records():
+    with open(os.path.join(BASE_DIR, "drinks.jsonl"), encoding="utf-8") as f:
+        return [json.loads(line) for line in f if line.strip()]
+
+
+def synthetic_records(count, seed=42):
+    """Gera ``count`` receitas com ids 0..count-1"""
+    rng = random.Random(seed)
+    base = base_records()
+    lines = sorted({line for record in base for line in record["ingredients"].split("\n")})
+    records = []
+    for i in range(count):
+        template = base[i % len(base)]
+        chosen = rng.sample(lines, rng.randint(2, 6))
+        chosen = [line + rng.choice(_VARIANTS) for line in chosen]
+        record = dict(template)
+        record["id"] = i
+        record["name"] = f"{template['name']} #{i}"
+        record["ingredients"] = "\n".join(chosen)
+        records.append(record)
+    return records
@@ -0,0 +1,242 @@
+"""API HTTP/JSON somente leitura do catálogo, para os tablets do bar.
+
+    GET /drinks                          índice: [{"id", "name"}, ...]
+    GET /drinks/<id>                     receita completa
+    GET /ingredients?q=gin,limão         drinks que usam todos os ingredientes
+    GET /ingredients?q=...&mode=shelf    drinks feitos só com eles
+
+Cada resposta é serializada uma vez, comprimida com gzip e guardada em cache
+com um ETag (hash do conteúdo) até o catálogo ser recarregado; tablets que
+repetem a consulta com ``If-None-Match`` recebem 304 sem corpo. As
+requisições são atendidas por um pool fixo de threads, fora do loop do Tk, e
+a conexão é fechada depois de cada resposta: um tablet que consulta a cada
+poucos segundos não prende uma thread do pool entre uma consulta e outra.
+
+    python catalog_server.py drinks.jsonl --port 8080
+"""
+import argparse
+import gzip
+import hashlib
+import json
+import socketserver
+import threading
+from collections import OrderedDict, namedtuple
+from concurrent.futures import ThreadPoolExecutor
+from http.server import BaseHTTPRequestHandler, HTTPServer
+from urllib.parse import parse_qs, urlsplit
+
+from catalog_store import CatalogError
+from ingredients import normalize
+
+DEFAULT_PORT = 8080
+DEFAULT_WORKERS = 8
+CACHE_ENTRIES = 4096        # respostas de drinks e buscas guardadas (o índice fica sempre)
+
+Response = namedtuple("Response", "status body gzipped etag")
+
+
+def make_response(data, status=200):
+    """Serializa, comprime e calcula o ETag de uma resposta"""
+    body = json.dumps(data, ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+    etag = '"' + hashlib.sha1(body).hexdigest()[:20] + '"'
+    return Response(status, body, gzip.compress(body, compresslevel=6, mtime=0), etag)
+
+
+class ResponseCache:
+    """Respostas prontas por caminho, descartadas quando o catálogo muda"""
+
+    def __init__(self, catalog, max_entries=CACHE_ENTRIES):
+        self.catalog = catalog
+        self.max_entries = max_entries
+        self._lock = threading.Lock()
+        self._generation = None
+        self._index = None
+        self._entries = OrderedDict()
+
+    def get(self, key, build):
+        """Resposta de ``key``; ``build`` só é chamado (sob a trava do catálogo) se faltar"""
+        with self._lock:
+            if self._generation != self.catalog.generation:
+                self._generation = self.catalog.generation
+                self._index = None
+                self._entries.clear()
+            response = self._index if key == "/drinks" else self._entries.get(key)
+            if response is not None:
+                if key != "/drinks":
+                    self._entries.move_to_end(key)
+                return response
+            generation = self._generation
+
+        with self.catalog.lock:
+            stale = self.catalog.generation != generation
+            data = build()
+        response = make_response(*data) if isinstance(data, tuple) else make_response(data)
+
+        with self._lock:
+            if not stale and self._generation == generation:
+                if key == "/drinks":
+                    self._index = response
+                else:
+                    self._entries[key] = response
+                    if len(self._entries) > self.max_entries:
+                        self._entries.popitem(last=False)
+        return response
+
+
+class _CatalogHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+    server_version = "OguruCatalog/1.0"
+    timeout = 5  # Cliente que não termina de enviar a requisição libera a thread do pool
+    disable_nagle_algorithm = True  # Cabeçalho e corpo saem em writes separados
+
+    def do_GET(self):
+        url = urlsplit(self.path)
+        path = url.path.rstrip("/") or "/"
+        try:
+            response = self.server.respond(path, parse_qs(url.query))
+        except Exception as e:
+            print(f"Erro na API em {self.path}: {e}")
+            response = make_response({"error": "erro interno"}, 500)
+
+        self.close_connection = True
+        if self._not_modified(response.etag):
+            self.send_response(304)
+            self.send_header("ETag", response.etag)
+            self.send_header("Content-Length", "0")
+            self.send_header("Connection", "close")
+            self.end_headers()
+            return
+
+        use_gzip = "gzip" in self.headers.get("Accept-Encoding", "")
+        body = response.gzipped if use_gzip else response.body
+        self.send_response(response.status)
+        self.send_header("Content-Type", "application/json; charset=utf-8")
+        self.send_header("Content-Length", str(len(body)))
+        self.send_header("ETag", response.etag)
+        self.send_header("Cache-Control", "no-cache")
+        self.send_header("Vary", "Accept-Encoding")
+        self.send_header("Access-Control-Allow-Origin", "*")
+        self.send_header("Connection", "close")
+        if use_gzip:
+            self.send_header("Content-Encoding", "gzip")
+        self.end_headers()
+        self.wfile.write(body)
+
+    def _not_modified(self, etag):
+        header = self.headers.get("If-None-Match")
+        if not header:
+            return False
+        tags = [tag.strip() for tag in header.split(",")]
+        return "*" in tags or etag in tags or "W/" + etag in tags
+
+    def log_message(self, format, *args):
+        pass  # Tablets consultando a cada poucos segundos encheriam o terminal
+
+
+class _PooledHTTPServer(socketserver.ThreadingMixIn, HTTPServer):
+    """``HTTPServer`` que atende cada conexão numa thread de um pool fixo"""
+
+    allow_reuse_address = True
+    request_queue_size = 128  # Uma conexão nova por requisição
+
+    def __init__(self, address, workers):
+        super().__init__(address, _CatalogHandler)
+        self._pool = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="api")
+
+    def process_request(self, request, client_address):
+        self._pool.submit(self.process_request_thread, request, client_address)
+
+    def server_close(self):
+        super().server_close()
+        self._pool.shutdown(wait=False)
+
+
+class CatalogServer:
+    """Servidor da API sobre um ``DrinkCatalog`` já carregado"""
+
+    def __init__(self, catalog, port=DEFAULT_PORT, host="0.0.0.0", workers=DEFAULT_WORKERS):
+        self.catalog = catalog
+        self.host = host
+        self.port = port
+        self.workers = workers
+        self.cache = ResponseCache(catalog)
+        self._server = None
+
+    def start(self):
+        self._server = _PooledHTTPServer((self.host, self.port), self.workers)
+        self._server.respond = self.respond
+        self.port = self._server.server_address[1]  # Porta real quando 0 foi pedido
+        threading.Thread(target=self._server.serve_forever, daemon=True).start()
+        return self
+
+    def stop(self):
+        if self._server is not None:
+            self._server.shutdown()
+            self._server.server_close()
+
+    def respond(self, path, query):
+        if path == "/drinks":
+            return self.cache.get(path, lambda: [{"id": drink["id"], "name": drink["name"]}
+                                                 for drink in self.catalog.drinks])
+        if path.startswith("/drinks/"):
+            try:
+                drink_id = int(path[len("/drinks/"):])
+            except ValueError:
+                return make_response({"error": "id inválido"}, 400)
+            try:
+                return self.cache.get(path, lambda: self._drink(drink_id))
+            except CatalogError:
+                return make_response({"error": "catálogo sendo atualizado"}, 503)
+        if path == "/ingredients":
+            terms = [term.strip() for value in query.get("q", []) for term in value.split(",")
+                     if term.strip()]
+            shelf = query.get("mode", [""])[0] == "shelf"
+            key = f"/ingredients?{'shelf' if shelf else 'contains'}={','.join(sorted(map(normalize, terms)))}"
+            if terms:
+                self.catalog.ensure_ingredient_index()  # Lê o catálogo todo: fora da trava
+            try:
+                return self.cache.get(key, lambda: self._ingredients(terms, shelf))
+            except CatalogError:
+                return make_response({"error": "catálogo sendo atualizado"}, 503)
+        return make_response({"error": "não encontrado"}, 404)
+
+    def _drink(self, drink_id):
+        if drink_id not in self.catalog.drink_by_id:
+            return {"error": "drink não encontrado"}, 404
+        return self.catalog.get(drink_id)  # CatalogError: arquivo salvo e ainda não recarregado
+
+    def _ingredients(self, terms, shelf):
+        if not terms:
+            return {"error": "informe q=ingrediente1,ingrediente2"}, 400
+        if self.catalog.ingredient_index is None:  # Catálogo trocado depois de ensure_ingredient_index
+            raise CatalogError("índice de ingredientes sendo montado")
+        ids = self.catalog.ingredient_filter(terms, shelf=shelf)
+        return [{"id": drink["id"], "name": drink["name"]}
+                for drink in self.catalog.drinks if drink["id"] in ids]
+
+
+def main():
+    from drink_model import DrinkCatalog
+
+    parser = argparse.ArgumentParser(description="API somente leitura do catálogo do Oguru")
+    parser.add_argument("catalog", help="catálogo de receitas (.jsonl, .json ou SQLite)")
+    parser.add_argument("--port", type=int, default=DEFAULT_PORT)
+    parser.add_argument("--host", default="0.0.0.0")
+    parser.add_argument("--workers", type=int, default=DEFAULT_WORKERS)
+    args = parser.parse_args()
+
+    catalog = DrinkCatalog(args.catalog)
+    try:
+        catalog.load()
+    except (OSError, CatalogError) as e:
+        parser.exit(1, f"Erro ao carregar catálogo: {e}\n")
+    server = CatalogServer(catalog, args.port, args.host, args.workers).start()
+    print(f"API do catálogo em http://{args.host}:{server.port}/drinks", flush=True)
+    try:
+        threading.Event().wait()
+    except KeyboardInterrupt:
+        server.stop()
+
+
+if __name__ == "__main__":
+    main()
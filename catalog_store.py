@@ -0,0 +1,310 @@
+"""Armazenamento do catálogo de drinks em disco.
+
+Os backends (SQLite, JSONL e JSON) expõem a mesma interface: ``load_index``
+devolve só o índice leve usado pela lista lateral (id e nome) e ``get``
+busca o registro completo sob demanda, quando o drink é aberto.
+"""
+import json
+import os
+import sqlite3
+import sys
+import threading
+from array import array
+
+# Campos de cada receita, na ordem usada pelos arquivos e pela tabela SQLite
+FIELDS = ("name", "ingredients", "instructions", "glass", "garnish",
+          "flavor", "appearance", "ml")
+
+SQLITE_PAGE_SIZE = 1000  # registros lidos por consulta em ``SQLiteCatalogStore.iter_records``
+
+
+class CatalogError(Exception):
+    """Falha ao abrir ou ler um catálogo"""
+
+
+def check_record(record, where):
+    """Confere os tipos dos campos de um registro completo (``CatalogError`` se inválido)"""
+    name = record.get("name")
+    if not isinstance(name, str) or not name.strip():
+        raise CatalogError(f"{where}: receita sem nome")
+    for field in FIELDS[1:-1]:
+        value = record.get(field)
+        if value is not None and not isinstance(value, str):
+            raise CatalogError(f"{where}: {name}: campo {field} inválido")
+    ml = record.get("ml")
+    try:
+        if ml is not None and not isinstance(ml, bool):
+            float(ml)
+        elif ml is not None:
+            raise TypeError
+    except (TypeError, ValueError):
+        raise CatalogError(f"{where}: {name}: volume (ml) inválido: {ml!r}")
+
+
+class CatalogStore:
+    """Interface comum dos backends de catálogo"""
+
+    def __init__(self, path):
+        self.path = path
+
+    def load_index(self):
+        """Lista de ``{"id", "name"}`` na ordem do catálogo"""
+        raise NotImplementedError
+
+    def get(self, drink_id):
+        """Registro completo (todos os ``FIELDS`` mais ``id``)"""
+        raise NotImplementedError
+
+    def iter_records(self):
+        """Percorre todos os registros completos, um de cada vez"""
+        for entry in self.load_index():
+            yield self.get(entry["id"])
+
+    def append_records(self, records):
+        """Acrescenta registros ao final do catálogo, sem regravar os existentes"""
+        raise NotImplementedError
+
+    def close(self):
+        pass
+
+
+class SQLiteCatalogStore(CatalogStore):
+    """Catálogo em uma tabela SQLite ``drinks``"""
+
+    def __init__(self, path):
+        super().__init__(path)
+        # A conexão é compartilhada entre a thread da interface e as de carga
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._lock = threading.Lock()
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS drinks ("
+            "id INTEGER PRIMARY KEY, name TEXT NOT NULL, ingredients TEXT, "
+            "instructions TEXT, glass TEXT, garnish TEXT, flavor TEXT, "
+            "appearance TEXT, ml INTEGER)"
+        )
+
+    def load_index(self):
+        with self._lock:
+            rows = self._conn.execute("SELECT id, name FROM drinks ORDER BY id").fetchall()
+        return [{"id": drink_id, "name": name} for drink_id, name in rows]
+
+    def get(self, drink_id):
+        with self._lock:
+            row = self._conn.execute(
+                f"SELECT id, {', '.join(FIELDS)} FROM drinks WHERE id = ?", (drink_id,)
+            ).fetchone()
+        if row is None:
+            raise KeyError(drink_id)
+        return _record_from_row(row)
+
+    def iter_records(self):
+        # Uma página por vez, sem manter o lock entre elas: a memória não cresce com a tabela
+        last_id = -1
+        while True:
+            with self._lock:
+                rows = self._conn.execute(
+                    f"SELECT id, {', '.join(FIELDS)} FROM drinks WHERE id > ? ORDER BY id LIMIT ?",
+                    (last_id, SQLITE_PAGE_SIZE)
+                ).fetchall()
+            for row in rows:
+                yield _record_from_row(row)
+            if len(rows) < SQLITE_PAGE_SIZE:
+                return
+            last_id = rows[-1][0]
+
+    def write_records(self, records):
+        """Substitui o conteúdo da tabela pelos registros informados"""
+        with self._lock, self._conn:
+            self._conn.execute("DELETE FROM drinks")
+            self._conn.executemany(
+                f"INSERT INTO drinks ({', '.join(FIELDS)}) VALUES ({', '.join('?' * len(FIELDS))})",
+                ([record.get(field) for field in FIELDS] for record in records)
+            )
+
+    def append_records(self, records):
+        with self._lock, self._conn:
+            self._conn.executemany(
+                f"INSERT INTO drinks ({', '.join(FIELDS)}) VALUES ({', '.join('?' * len(FIELDS))})",
+                ([record.get(field) for field in FIELDS] for record in records)
+            )
+
+    def close(self):
+        self._conn.close()
+
+
+class JSONLCatalogStore(CatalogStore):
+    """Catálogo com uma receita JSON por linha.
+
+    Na abertura só os nomes são guardados, junto com o deslocamento em bytes
+    de cada linha; ``get`` relê apenas a linha pedida e confere o nome, já
+    que o arquivo pode ter sido salvo de novo depois da leitura do índice.
+    """
+
+    def __init__(self, path):
+        super().__init__(path)
+        self._offsets = array("Q")
+        self._names = []
+        self._lock = threading.Lock()
+        self._file = None
+
+    def load_index(self):
+        index = []
+        offsets = array("Q")
+        with open(self.path, "rb") as f:
+            offset = 0
+            for line_number, line in enumerate(f, 1):
+                if line.strip():
+                    try:
+                        name = json.loads(line)["name"]
+                    except (ValueError, KeyError, TypeError) as e:
+                        raise CatalogError(f"{self.path}:{line_number}: registro inválido ({e})")
+                    if not isinstance(name, str):
+                        raise CatalogError(f"{self.path}:{line_number}: nome inválido ({name!r})")
+                    index.append({"id": len(offsets), "name": name})
+                    offsets.append(offset)
+                offset += len(line)
+        with self._lock:
+            self._offsets = offsets
+            self._names = [entry["name"] for entry in index]
+            if self._file is not None:  # Arquivo pode ter sido regravado
+                self._file.close()
+                self._file = None
+        return index
+
+    def get(self, drink_id):
+        if not 0 <= drink_id < len(self._offsets):
+            raise KeyError(drink_id)
+        with self._lock:
+            if self._file is None:
+                self._file = open(self.path, "rb")
+            self._file.seek(self._offsets[drink_id])
+            line = self._file.readline()
+            name = self._names[drink_id]
+        try:
+            record = json.loads(line)
+        except ValueError:
+            record = None
+        if not isinstance(record, dict) or record.get("name") != name:
+            raise CatalogError(f"{self.path}: arquivo alterado desde a leitura do índice")
+        record["id"] = drink_id
+        return record
+
+    def iter_records(self):
+        with open(self.path, "rb") as f:
+            drink_id = 0
+            for line in f:
+                if line.strip():
+                    record = json.loads(line)
+                    record["id"] = drink_id
+                    drink_id += 1
+                    yield record
+
+    def write_records(self, records):
+        tmp_path = self.path + ".tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            for record in records:
+                f.write(json.dumps(_file_record(record), ensure_ascii=False) + "\n")
+        os.replace(tmp_path, self.path)
+        self.load_index()
+
+    def append_records(self, records):
+        """Acrescenta linhas ao arquivo; o índice desta instância não é atualizado"""
+        lines = [json.dumps(_file_record(record), ensure_ascii=False) + "\n" for record in records]
+        with open(self.path, "a+b") as f:
+            f.seek(0, os.SEEK_END)
+            if f.tell() > 0:
+                f.seek(-1, os.SEEK_END)
+                if f.read(1) != b"\n":  # Última receita gravada sem quebra de linha
+                    f.write(b"\n")
+            f.write("".join(lines).encode("utf-8"))
+
+    def close(self):
+        with self._lock:
+            if self._file is not None:
+                self._file.close()
+                self._file = None
+
+
+class JSONCatalogStore(CatalogStore):
+    """Catálogo em um único array JSON.
+
+    O formato não permite ler um registro isolado, então o arquivo é
+    carregado inteiro; para catálogos grandes prefira JSONL ou SQLite.
+    """
+
+    def __init__(self, path):
+        super().__init__(path)
+        self._records = []
+
+    def load_index(self):
+        try:
+            with open(self.path, encoding="utf-8") as f:
+                self._records = json.load(f)
+        except ValueError as e:
+            raise CatalogError(f"{self.path}: JSON inválido ({e})")
+        if not isinstance(self._records, list):
+            raise CatalogError(f"{self.path}: o catálogo deve ser um array JSON")
+        for i, record in enumerate(self._records):
+            if not isinstance(record, dict) or not isinstance(record.get("name"), str):
+                raise CatalogError(f"{self.path}: registro {i + 1} inválido")
+        return [{"id": i, "name": record["name"]} for i, record in enumerate(self._records)]
+
+    def get(self, drink_id):
+        if not 0 <= drink_id < len(self._records):
+            raise KeyError(drink_id)
+        return dict(self._records[drink_id], id=drink_id)
+
+    def write_records(self, records):
+        tmp_path = self.path + ".tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump([_file_record(record) for record in records], f, ensure_ascii=False, indent=2)
+        os.replace(tmp_path, self.path)
+        self.load_index()
+
+    def append_records(self, records):
+        """Regrava o array inteiro com os novos registros no final"""
+        self.load_index()
+        self.write_records(self._records + list(records))
+
+
+def _file_record(record):
+    """Registro como gravado nos arquivos: os ``FIELDS`` e depois os campos extras (``image``), sem o id"""
+    stored = {field: record.get(field) for field in FIELDS}
+    stored.update((key, value) for key, value in record.items() if key not in stored and key != "id")
+    return stored
+
+
+def _record_from_row(row):
+    record = dict(zip(FIELDS, row[1:]))
+    record["id"] = row[0]
+    return record
+
+
+def open_catalog(path):
+    """Escolhe o backend pela extensão do arquivo"""
+    extension = os.path.splitext(path)[1].lower()
+    if extension in (".db", ".sqlite", ".sqlite3"):
+        return SQLiteCatalogStore(path)
+    if extension == ".jsonl":
+        return JSONLCatalogStore(path)
+    if extension == ".json":
+        return JSONCatalogStore(path)
+    raise CatalogError(f"Formato de catálogo não suportado: {path}")
+
+
+def convert_catalog(source_path, target_path):
+    """Copia todas as receitas de um catálogo para outro formato"""
+    source = open_catalog(source_path)
+    target = open_catalog(target_path)
+    try:
+        target.write_records(source.iter_records())
+    finally:
+        source.close()
+        target.close()
+
+
+if __name__ == "__main__":
+    if len(sys.argv) != 3:
+        print("Uso: python catalog_store.py <origem> <destino>  (ex.: drinks.jsonl drinks.db)")
+        sys.exit(1)
+    convert_catalog(sys.argv[1], sys.argv[2])
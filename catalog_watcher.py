@@ -0,0 +1,100 @@
+"""Recarga do catálogo quando o arquivo é alterado em disco.
+
+Uma thread consulta periodicamente a data de modificação e o tamanho do
+arquivo. Quando eles mudam e ficam estáveis por uma consulta (o editor
+terminou de gravar), a nova versão é lida e comparada com a anterior pelas
+somas de verificação de cada receita, ainda fora da thread da interface. A
+interface recebe só a diferença (``CatalogDiff``) por uma ``queue.Queue``.
+"""
+import os
+import threading
+
+
+
+def file_signature(path):
+    """Data de modificação e tamanho do arquivo (None se ele não existir)"""
+    try:
+        stat = os.stat(path)
+    except OSError:
+        return None
+    return stat.st_mtime_ns, stat.st_size
+
+
+class CatalogWatcher:
+    """Observa o arquivo de ``catalog`` e coloca cada ``CatalogDiff`` em ``diffs``"""
+
+    def __init__(self, catalog, diffs, interval=1.0):
+        self.catalog = catalog
+        self.diffs = diffs
+        self.interval = interval
+        self._stop = threading.Event()
+        self._thread = None
+        self._paused = False
+        self._resync = False
+
+    def start(self):
+        self._thread = threading.Thread(target=self._run, daemon=True)
+        self._thread.start()
+        return self
+
+    def _baseline(self):
+        """Assinatura do arquivo e somas de verificação do catálogo (None se a leitura falhar)"""
+        signature = file_signature(self.catalog.path)
+        try:
+            return signature, self.catalog.fingerprints()
+        except Exception as e:  # Tentada de novo quando o arquivo mudar
+            print(f"Erro ao recarregar catálogo: {e}")
+            return signature, None
+
+    def _run(self):
+        signature, fingerprints = self._baseline()
+        pending = None
+        while not self._stop.wait(self.interval):
+            if self._paused:
+                pending = None
+                continue
+            if self._resync:
+                self._resync = False
+                signature, fingerprints = self._baseline()
+                continue
+            current = file_signature(self.catalog.path)
+            if current is None or current == signature:
+                pending = None
+                continue
+            if current != pending:
+                pending = current  # Ainda sendo gravado? Confere na próxima consulta
+                continue
+            pending = None
+            if fingerprints is None:
+                signature, fingerprints = self._baseline()
+                continue
+            try:
+                diff = self.catalog.prepare_reload(fingerprints)
+            except Exception as e:  # Uma edição inválida não pode parar o observador
+                signature = current
+                print(f"Erro ao recarregar catálogo: {e}")
+                continue
+            if self._paused:  # Pausado durante a leitura: refeita depois de ``resume``
+                diff.store.close()
+                continue
+            signature = current
+            fingerprints = diff.fingerprints
+            # Mesmo sem receitas alteradas a posição das linhas pode ter mudado
+            self.diffs.put(diff)
+
+    def pause(self):
+        """Suspende a recarga enquanto outra parte do app grava no arquivo"""
+        self._paused = True
+
+    def resume(self, resync=True):
+        """Retoma a recarga.
+
+        Com ``resync`` o catálogo já reflete o arquivo (foi trocado por quem
+        gravou) e a versão atual só passa a ser a referência; sem ele, as
+        alterações feitas durante a pausa chegam como uma diferença comum.
+        """
+        self._resync = resync
+        self._paused = False
+
+    def stop(self):
+        self._stop.set()
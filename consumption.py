@@ -0,0 +1,175 @@
+"""Fechamento do dia: consumo de cada ingrediente a partir das vendas.
+
+``ConsumptionEngine`` monta, a partir do catálogo, a matriz receita ×
+ingrediente com o volume (ml) de cada ingrediente em cada receita. O
+consumo de um log de pedidos é o produto do vetor de quantidades vendidas
+por receita por essa matriz, calculado de uma vez com NumPy.
+
+A matriz é guardada em formato esparso (linha, coluna, valor): um catálogo
+grande tem milhares de ingredientes, mas cada receita usa poucos.
+"""
+import csv
+from collections import namedtuple
+
+import numpy as np
+
+from ingredients import UNIT_ML, normalize, parse_ingredients
+
+DEFAULT_BOTTLE_ML = 750.0
+
+IngredientUsage = namedtuple("IngredientUsage", "name ml bottles units")
+
+
+class ConsumptionReport:
+    """Resultado de ``ConsumptionEngine.compute``"""
+
+    def __init__(self, usage, orders, total_ml, unknown):
+        self.usage = usage          # IngredientUsage, do mais ao menos consumido
+        self.orders = orders        # drinks vendidos reconhecidos
+        self.total_ml = total_ml    # volume total servido (campo ``ml`` das receitas)
+        self.unknown = unknown      # nome → quantidade de pedidos fora do catálogo
+
+    def as_text(self):
+        lines = [f"Drinks vendidos: {self.orders}", f"Volume servido: {self.total_ml:.0f} ml", ""]
+        lines.append(f"{'Ingrediente':<32}{'ml':>10}{'garrafas':>10}{'unid.':>8}")
+        for item in self.usage:
+            bottles = f"{item.bottles:.2f}" if item.ml else "-"
+            units = f"{item.units:.0f}" if item.units else "-"
+            lines.append(f"{item.name[:31]:<32}{item.ml:>10.0f}{bottles:>10}{units:>8}")
+        if self.unknown:
+            lines.append("")
+            lines.append("Pedidos fora do catálogo:")
+            for name, count in sorted(self.unknown.items()):
+                lines.append(f"  {name}: {count:g}")
+        return "\n".join(lines)
+
+
+class ConsumptionEngine:
+    """Matriz de volumes por receita e cálculo do consumo em lote"""
+
+    def __init__(self, records, bottle_ml=None):
+        names = []
+        row_of = {}
+        columns = {}          # ingrediente normalizado → coluna
+        display = []          # coluna → nome como aparece na receita
+        entries = []          # (linha, coluna, ml, unidades) das células não nulas
+        totals = []
+
+        for record in records:
+            row = len(names)
+            names.append(record["name"])
+            row_of.setdefault(normalize(record["name"]), row)
+            totals.append(float(record.get("ml") or 0))
+
+            measured = 0.0
+            unmeasured = []
+            for item in parse_ingredients(record.get("ingredients") or ""):
+                key = normalize(item.name)
+                if key not in columns:
+                    columns[key] = len(display)
+                    display.append(item.name[:1].upper() + item.name[1:])
+                column = columns[key]
+                if item.quantity is not None and item.unit in UNIT_ML:
+                    volume = item.quantity * UNIT_ML[item.unit]
+                    measured += volume
+                    entries.append((row, column, volume, 0.0))
+                elif item.quantity is not None:
+                    entries.append((row, column, 0.0, item.quantity))
+                else:
+                    unmeasured.append(column)
+
+            # "Complete com água com gás": um único item sem medida recebe o
+            # que falta para o volume total da receita
+            remainder = totals[-1] - measured
+            if len(unmeasured) == 1 and remainder > 0:
+                entries.append((row, unmeasured[0], remainder, 0.0))
+
+        self.names = names
+        self.ingredients = display
+        self._row_of = row_of
+        self._columns = columns
+        table = np.asarray(entries, dtype=np.float64).reshape(-1, 4)
+        self._rows = table[:, 0].astype(np.int64)
+        self._cols = table[:, 1].astype(np.int64)
+        self._ml = table[:, 2].copy()
+        self._units = table[:, 3].copy()
+        self._recipe_ml = np.asarray(totals, dtype=np.float64)
+
+        self.bottle_ml = np.full(len(display), DEFAULT_BOTTLE_ML)
+        for name, size in (bottle_ml or {}).items():
+            column = columns.get(normalize(name))
+            if column is not None:
+                self.bottle_ml[column] = size
+
+    def matrix(self):
+        """Matriz densa receita × ingrediente em ml (para inspeção em catálogos pequenos)"""
+        dense = np.zeros((len(self.names), len(self.ingredients)))
+        np.add.at(dense, (self._rows, self._cols), self._ml)
+        return dense
+
+    def rows_for(self, names):
+        """Converte nomes de drinks em linhas da matriz (-1 para desconhecidos).
+
+        Só os nomes distintos passam pelo dicionário; a expansão para todos
+        os pedidos é feita pelo NumPy.
+        """
+        unique, inverse = np.unique(np.asarray(names, dtype=object), return_inverse=True)
+        lookup = np.array([self._row_of.get(normalize(name), -1) for name in unique],
+                          dtype=np.int64)
+        return lookup[inverse] if len(unique) else np.empty(0, dtype=np.int64)
+
+    def compute(self, names, quantities=None):
+        """Consumo por ingrediente para os pedidos (nomes e, opcionalmente, quantidades)"""
+        rows = self.rows_for(names)
+        quantities = (np.ones(len(rows)) if quantities is None
+                      else np.asarray(quantities, dtype=np.float64))
+        known = rows >= 0
+
+        # Quantidade vendida por receita e, numa única passada, o produto pela matriz
+        sold = np.bincount(rows[known], weights=quantities[known], minlength=len(self.names))
+        per_entry = sold[self._rows]
+        ml = np.bincount(self._cols, weights=per_entry * self._ml, minlength=len(self.ingredients))
+        units = np.bincount(self._cols, weights=per_entry * self._units,
+                            minlength=len(self.ingredients))
+        bottles = ml / self.bottle_ml
+
+        unknown = {}
+        if not known.all():
+            missing, inverse = np.unique(np.asarray(names, dtype=object)[~known], return_inverse=True)
+            counts = np.bincount(inverse, weights=quantities[~known], minlength=len(missing))
+            unknown = dict(zip(missing.tolist(), counts.tolist()))
+
+        order = np.argsort(-ml, kind="stable")
+        usage = [IngredientUsage(self.ingredients[i], float(ml[i]), float(bottles[i]), float(units[i]))
+                 for i in order if ml[i] or units[i]]
+        return ConsumptionReport(usage, int(sold.sum()), float(sold @ self._recipe_ml), unknown)
+
+
+def read_order_log(path):
+    """Lê um log de pedidos: CSV com colunas ``name``/``nome`` e, opcionalmente,
+    ``quantity``/``quantidade``, ou um arquivo texto com um drink por linha"""
+    names, quantities = [], []
+    with open(path, newline="", encoding="utf-8-sig") as f:  # CSV do Excel começa com BOM
+        header = [column.strip() for column in f.readline().lower().split(",")]
+        f.seek(0)
+        name_column = next((c for c in ("name", "nome") if c in header), None)
+        if name_column is not None:
+            reader = csv.reader(f)
+            next(reader)
+            name_index = header.index(name_column)
+            quantity_index = next((header.index(c) for c in ("quantity", "quantidade")
+                                   if c in header), None)
+            for row in reader:
+                if len(row) <= name_index or not row[name_index].strip():
+                    continue
+                names.append(row[name_index].strip())
+                # Célula de quantidade ausente (linha curta) vale 1, como a vazia
+                quantity = (row[quantity_index].strip()
+                            if quantity_index is not None and quantity_index < len(row) else "")
+                quantities.append(float(quantity) if quantity else 1.0)
+        else:
+            for line in f:
+                if line.strip():
+                    names.append(line.strip())
+                    quantities.append(1.0)
+    return names, quantities
@@ -0,0 +1,375 @@
+"""Camada de dados do app, sem dependência do Tk.
+
+``DrinkCatalog`` reúne o armazenamento em disco, o índice leve da lista, as
+buscas e a formatação dos detalhes que ``DrinkApp`` exibe, para que tudo
+isso possa ser testado e medido sem display.
+"""
+import json
+import threading
+import zlib
+
+from catalog_store import FIELDS, check_record, open_catalog
+from facets import FacetIndex
+from ingredients import IngredientIndex, normalize
+from search import NameSearchIndex
+
+
+def format_drink_details(drink):
+    """Seções do painel de detalhes, cada uma como uma lista de linhas.
+
+    A primeira linha traz o ícone e o título; seções de uma linha só são
+    exibidas em destaque e as demais (ingredientes, preparo) em texto normal.
+    """
+    # Registros de JSON/JSONL podem não ter todos os campos
+    ml = drink.get("ml")
+    details = [
+        ("🍹 Copo", drink.get("glass")),
+        ("🧊 Volume", f"{ml}ml" if ml not in (None, "") else ""),
+        ("🌿 Ingredientes", drink.get("ingredients")),
+        ("👨‍🍳 Modo de Preparo", drink.get("instructions")),
+        ("🍒 Guarnição", drink.get("garnish")),
+        ("👅 Sabor", drink.get("flavor")),
+        ("👀 Aparência", drink.get("appearance"))
+    ]
+    sections = []
+    for icon, text in details:
+        lines = str(text or "").split("\n")
+        lines[0] = icon + " " + lines[0]
+        sections.append(lines)
+    return sections
+
+
+def unique_entries(entries):
+    """Entradas sem nomes repetidos (sem diferenciar maiúsculas e acentos): vale a primeira"""
+    seen = set()
+    unique = []
+    for entry in entries:
+        key = normalize(entry["name"])
+        if key not in seen:
+            seen.add(key)
+            unique.append(entry)
+    return unique
+
+
+def record_fingerprint(record):
+    """Soma de verificação do conteúdo de uma receita (sem o id)"""
+    content = json.dumps([record.get(field) for field in FIELDS], ensure_ascii=False)
+    return zlib.crc32(content.encode("utf-8"))
+
+
+class CatalogDiff:
+    """Diferença entre o catálogo carregado e uma nova versão do arquivo.
+
+    Preparada fora da thread da interface por ``DrinkCatalog.prepare_reload``
+    e aplicada depois por ``DrinkCatalog.apply_reload``.
+    """
+
+    def __init__(self, store, entries, fingerprints, added, removed, changed, records):
+        self.store = store                # armazenamento já aberto na nova versão
+        self.entries = entries            # índice novo (ids do armazenamento), na ordem do arquivo
+        self.fingerprints = fingerprints  # nome normalizado → soma de verificação
+        self.added = added                # nomes normalizados
+        self.removed = removed
+        self.changed = changed
+        self.records = records            # nome normalizado → registro completo (novos e alterados)
+
+    def __bool__(self):
+        return bool(self.added or self.removed or self.changed)
+
+
+class DrinkCatalog:
+    """Catálogo carregado: índice da lista, consultas e registros completos.
+
+    Os ids das entradas são estáveis entre recargas do arquivo; enquanto
+    nenhuma recarga acontecer eles coincidem com os ids do armazenamento.
+    """
+
+    def __init__(self, path):
+        self.path = path
+        self.store = None
+        self.drinks = []
+        self.drink_by_id = {}
+        self.drink_by_name = {}
+        self.search_index = NameSearchIndex()
+        self.ingredient_index = None  # Montados em segundo plano pela interface
+        self.facet_index = None
+        self.similarity_index = None
+        self._similarity_updates = None  # (tabela antiga, removidos, id → registro) a aplicar
+        self.generation = 0           # Incrementado a cada recarga do arquivo
+        self.lock = threading.RLock()  # Recargas x leituras de outras threads (API HTTP)
+        self._refs = None  # id da entrada → id no armazenamento (None enquanto forem iguais)
+        self._next_id = 0
+
+    def load(self):
+        """Abre o armazenamento e monta o índice leve e a busca por nome.
+
+        Receitas com o nome de outra anterior no arquivo ficam de fora.
+        """
+        store = open_catalog(self.path)
+        try:
+            index = store.load_index()
+        except Exception:
+            store.close()  # ``store`` continua None: nada foi carregado
+            raise
+        self.store = store
+        self.drinks = unique_entries(index)
+        self.drink_by_id = {drink["id"]: drink for drink in self.drinks}
+        self.drink_by_name = {normalize(drink["name"]): drink for drink in self.drinks}
+        self.search_index = NameSearchIndex(self.drinks)
+        self.ingredient_index = None
+        self.facet_index = None
+        self.similarity_index = None
+        self._similarity_updates = None
+        self.generation += 1
+        self._refs = None
+        if len(self.drinks) < len(index):  # Repetidas continuam no armazenamento, sem entrada
+            self._refs = {drink_id: drink_id for drink_id in self.drink_by_id}
+        self._next_id = max(self.drink_by_id, default=-1) + 1
+        return self.drinks
+
+    def get(self, drink_id):
+        """Registro completo, lido do armazenamento sob demanda"""
+        if self._refs is None:
+            return self.store.get(drink_id)
+        record = self.store.get(self._refs[drink_id])
+        record["id"] = drink_id
+        return record
+
+    def iter_records(self):
+        with self.lock:  # Armazenamento e ids da mesma versão do arquivo
+            store, refs = self.store, self._refs
+        if store is None:  # Catálogo não carregado
+            return iter(())
+        if refs is None:
+            return store.iter_records()
+        return self._iter_translated(store, {ref: drink_id for drink_id, ref in refs.items()})
+
+    @staticmethod
+    def _iter_translated(store, id_of_ref):
+        for record in store.iter_records():
+            drink_id = id_of_ref.get(record["id"])
+            if drink_id is not None:  # Sem entrada: nome repetido no arquivo
+                record["id"] = drink_id
+                yield record
+
+    def fingerprints(self):
+        """Soma de verificação de cada receita, por nome normalizado (lê o catálogo todo).
+
+        Vazio se o catálogo não chegou a ser carregado: toda receita do arquivo é nova.
+        """
+        if self.store is None:
+            return {}
+        return {normalize(record["name"]): record_fingerprint(record)
+                for record in self.iter_records()}
+
+    def prepare_reload(self, previous):
+        """Lê a nova versão do arquivo e compara com ``previous`` (de ``fingerprints``).
+
+        Não altera o catálogo em uso, então pode rodar em segundo plano. Os
+        registros são conferidos aqui (``CatalogError`` se algum for
+        inválido), para que a aplicação na interface não falhe no meio.
+        """
+        store = open_catalog(self.path)
+        try:
+            entries = unique_entries(store.load_index())
+            records = {}
+            for record in store.iter_records():
+                check_record(record, self.path)
+                records.setdefault(normalize(record["name"]), record)  # A primeira, como em entries
+        except Exception:
+            store.close()
+            raise
+        fingerprints = {name: record_fingerprint(record) for name, record in records.items()}
+        added = fingerprints.keys() - previous.keys()
+        removed = previous.keys() - fingerprints.keys()
+        changed = {name for name in fingerprints.keys() & previous.keys()
+                   if fingerprints[name] != previous[name]}
+        wanted = added | changed
+        return CatalogDiff(store, entries, fingerprints, added, removed, changed,
+                           {name: records[name] for name in wanted})
+
+    def apply_reload(self, diff):
+        """Troca o armazenamento e atualiza só as entradas e índices afetados.
+
+        A lista ``drinks`` é alterada no lugar e as entradas sem mudança de
+        nome são os mesmos objetos de antes. Devolve os ids
+        ``(adicionados, removidos, alterados)``.
+        """
+        with self.lock:
+            refs = {}
+            drinks = []
+            added_ids, changed_ids = set(), set()
+            removed_ids = {self.drink_by_name[name]["id"] for name in diff.removed
+                           if name in self.drink_by_name}
+            for entry in diff.entries:
+                key = normalize(entry["name"])
+                drink = self.drink_by_name.get(key)
+                if drink is None or drink["id"] in removed_ids:
+                    drink = {"id": self._next_id, "name": entry["name"]}
+                    self._next_id += 1
+                    self.drink_by_name[key] = drink
+                    self.drink_by_id[drink["id"]] = drink
+                    self.search_index.add(drink["id"], drink["name"])
+                    added_ids.add(drink["id"])
+                else:
+                    drink["name"] = entry["name"]  # Mesma chave, grafia pode ter mudado
+                    if key in diff.changed:
+                        changed_ids.add(drink["id"])
+                refs[drink["id"]] = entry["id"]
+                drinks.append(drink)
+
+            for name in diff.removed:
+                drink = self.drink_by_name.pop(name, None)
+                if drink is not None:
+                    del self.drink_by_id[drink["id"]]
+                    self.search_index.remove(drink["id"])
+            # Novas no meio do arquivo ou linhas trocadas de lugar: resultados na ordem da lista
+            self.search_index.reorder(drink["id"] for drink in drinks)
+
+            if self.ingredient_index is not None:
+                for drink_id in removed_ids:
+                    self.ingredient_index.remove(drink_id)
+                for drink_id in added_ids | changed_ids:
+                    record = diff.records[normalize(self.drink_by_id[drink_id]["name"])]
+                    self.ingredient_index.add(drink_id, record.get("ingredients"))
+
+            if self.facet_index is not None:
+                for drink_id in removed_ids:
+                    self.facet_index.remove(drink_id)
+                for drink_id in added_ids | changed_ids:
+                    self.facet_index.add(drink_id, diff.records[normalize(self.drink_by_id[drink_id]["name"])])
+
+            # A tabela de parecidos custa milissegundos por receita alterada: sai de uso
+            # e as alterações são aplicadas em segundo plano por build_similarity_index
+            if self.similarity_index is not None and (removed_ids or added_ids or changed_ids):
+                self._similarity_updates = (self.similarity_index, set(), {})
+                self.similarity_index = None
+            if self._similarity_updates is not None:
+                index, removed, records = self._similarity_updates
+                for drink_id in removed_ids:
+                    records.pop(drink_id, None)
+                    removed.add(drink_id)
+                for drink_id in added_ids | changed_ids:
+                    records[drink_id] = diff.records[normalize(self.drink_by_id[drink_id]["name"])]
+                if len(removed) + len(records) > max(100, len(drinks) // 10):
+                    self._similarity_updates = None  # Mais barato remontar do zero
+
+            self.generation += 1
+            old_store, self.store = self.store, diff.store
+            self._refs = refs
+            self.drinks[:] = drinks
+            if old_store is not None:
+                old_store.close()
+            return added_ids, removed_ids, changed_ids
+
+    def adopt(self, other):
+        """Passa a usar o conteúdo de ``other``, outro catálogo já carregado do mesmo arquivo.
+
+        O catálogo novo (e seus índices) pode ser montado em segundo plano;
+        aqui só as referências são trocadas. ``drinks`` continua sendo a
+        mesma lista e os ids passam a ser os de ``other``.
+        """
+        with self.lock:
+            old_store, self.store = self.store, other.store
+            self.drinks[:] = other.drinks
+            self.drink_by_id = other.drink_by_id
+            self.drink_by_name = other.drink_by_name
+            self.search_index = other.search_index
+            self.ingredient_index = other.ingredient_index
+            self.facet_index = other.facet_index
+            self.similarity_index = other.similarity_index
+            self._similarity_updates = None
+            self.generation += 1
+            self._refs = other._refs
+            self._next_id = other._next_id
+            other.store = None
+            if old_store is not None:
+                old_store.close()
+
+    def find(self, name):
+        """Entrada do índice pelo nome, sem diferenciar maiúsculas e acentos"""
+        return self.drink_by_name.get(normalize(name))
+
+    def build_ingredient_index(self):
+        """Monta o índice invertido de ingredientes (lê todos os registros)"""
+        return IngredientIndex.from_records(self.iter_records())
+
+    def ensure_ingredient_index(self):
+        """Índice de ingredientes, montado aqui se ainda não existir.
+
+        A leitura dos registros acontece fora de ``lock``, para não bloquear
+        recargas; se o catálogo mudar no meio, o índice é montado de novo.
+        """
+        while True:
+            index = self.ingredient_index
+            if index is not None:
+                return index
+            generation = self.generation
+            try:
+                index = self.build_ingredient_index()
+            except Exception:
+                if self.generation == generation:
+                    raise
+                continue  # Arquivo trocado durante a leitura
+            with self.lock:
+                if self.generation == generation and self.ingredient_index is None:
+                    self.ingredient_index = index
+
+    def build_facet_index(self):
+        """Monta as colunas e bitmaps dos filtros de copo, sabor e volume (lê todos os registros)"""
+        return FacetIndex.from_records(self.iter_records())
+
+    def facet_filter(self, glass=None, flavor=None, max_ml=None):
+        """Ids que atendem aos filtros de copo, sabor e volume (None sem filtro ou sem índice)"""
+        if self.facet_index is None or not (glass or flavor or max_ml is not None):
+            return None
+        return set(self.facet_index.filter(glass, flavor, max_ml))
+
+    def build_similarity_index(self):
+        """Monta a tabela de drinks parecidos (pode rodar em segundo plano).
+
+        Depois de uma recarga, a tabela anterior é reaproveitada e só as
+        receitas alteradas são recalculadas; sem ela, todos os registros são lidos.
+        """
+        from similarity import SimilarityIndex  # Import adiado: usa NumPy
+        with self.lock:
+            updates, self._similarity_updates = self._similarity_updates, None
+        if updates is None:
+            return SimilarityIndex(self.iter_records())
+        index, removed, records = updates
+        for drink_id in removed:
+            index.remove(drink_id)
+        for drink_id, record in records.items():
+            index.add(drink_id, record)
+        return index
+
+    def similar_drinks(self, drink_id, count=4):
+        """Entradas dos drinks mais parecidos (lista vazia enquanto a tabela não existir)"""
+        if self.similarity_index is None:
+            return []
+        return [self.drink_by_id[similar_id]
+                for similar_id in self.similarity_index.similar(drink_id, count)]
+
+    def ingredient_filter(self, terms, shelf=False):
+        """Ids que usam todos os ``terms`` ou, com ``shelf``, feitos só com eles"""
+        index = self.ensure_ingredient_index()
+        if shelf:
+            return set(index.makeable_from(terms))
+        return set(index.containing(terms))
+
+    def filter_drinks(self, query="", ids=None):
+        """Entradas da lista que casam com a busca por nome e estão em ``ids``.
+
+        Devolve ``None`` quando não há filtro algum (lista completa).
+        """
+        ordered = self.search_index.search(query)
+        if ordered is None and ids is None:
+            return None
+        if ordered is None:
+            return [drink for drink in self.drinks if drink["id"] in ids]
+        return [self.drink_by_id[drink_id] for drink_id in ordered
+                if ids is None or drink_id in ids]
+
+    def close(self):
+        if self.store is not None:
+            self.store.close()
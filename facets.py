@@ -0,0 +1,165 @@
+"""Filtros por copo, sabor e volume com índices de bitmap.
+
+Em vez de um dicionário por receita, os campos usados nos filtros ficam em
+colunas compactas: copo e sabor codificados por dicionário (cada texto
+distinto é guardado uma vez e a receita guarda só o código num
+``array``) e o volume num ``array`` de ``double``. Cada valor de copo, cada
+palavra do sabor e cada volume distinto tem um bitmap (um ``int`` do Python)
+com as receitas que o têm, então combinar filtros é só AND/OR entre
+inteiros, como no índice de ingredientes.
+"""
+from array import array
+from bisect import bisect_right, insort
+
+from ingredients import _slots_of, normalize
+
+# Palavras do sabor que não servem de filtro ("Doce e levemente cítrico")
+FLAVOR_STOPWORDS = {"com", "sem", "muito", "pouco", "bem", "levemente", "mais", "menos"}
+
+
+class _Dictionary:
+    """Codificação por dicionário de uma coluna de texto (valor → código)"""
+
+    def __init__(self):
+        self.values = []
+        self._code_of = {}
+
+    def encode(self, value):
+        code = self._code_of.get(value)
+        if code is None:
+            code = self._code_of[value] = len(self.values)
+            self.values.append(value)
+        return code
+
+
+def flavor_words(flavor):
+    """Palavras normalizadas do sabor que viram filtro ("Doce e cítrico" → doce, citrico)"""
+    return {word for word in normalize(flavor or "").replace(",", " ").split()
+            if len(word) > 2 and word not in FLAVOR_STOPWORDS}
+
+
+class FacetIndex:
+    """Colunas de copo, sabor e volume com um bitmap por valor.
+
+    As receitas são identificadas pelo ``id`` do catálogo; internamente cada
+    uma ocupa uma posição (bit) fixa, como em ``IngredientIndex``.
+    """
+
+    def __init__(self):
+        self._slot_of = {}              # id da receita → posição
+        self._ids = array("q")          # posição → id (-1 quando removida)
+        self._glass = array("I")        # posição → código do copo
+        self._flavor = array("I")       # posição → código do sabor
+        self._ml = array("d")           # posição → volume
+        self._glasses = _Dictionary()   # textos dos copos como aparecem nas receitas
+        self._flavors = _Dictionary()
+        self._glass_masks = []          # código do copo → bitmap
+        self._word_masks = {}           # palavra do sabor → bitmap
+        self._word_labels = {}          # palavra normalizada → como aparece no sabor
+        self._ml_masks = {}             # volume → bitmap
+        self._ml_values = []            # volumes distintos, em ordem
+        self._live = 0
+
+    def __len__(self):
+        return len(self._slot_of)
+
+    @classmethod
+    def from_records(cls, records):
+        index = cls()
+        for record in records:
+            index.add(record["id"], record)
+        return index
+
+    def add(self, drink_id, record):
+        """Indexa (ou reindexa) copo, sabor e volume de uma receita"""
+        if drink_id in self._slot_of:
+            self.remove(drink_id)
+        slot = len(self._ids)
+        bit = 1 << slot
+
+        glass = self._glasses.encode((record.get("glass") or "").strip())
+        if glass == len(self._glass_masks):
+            self._glass_masks.append(0)
+        self._glass_masks[glass] |= bit
+
+        flavor_text = (record.get("flavor") or "").strip()
+        flavor = self._flavors.encode(flavor_text)
+        for word in flavor_words(flavor_text):
+            if word not in self._word_masks:
+                self._word_masks[word] = 0
+                self._word_labels[word] = next(
+                    w for w in flavor_text.replace(",", " ").split() if normalize(w) == word).lower()
+            self._word_masks[word] |= bit
+
+        ml = float(record.get("ml") or 0)
+        if ml not in self._ml_masks:
+            self._ml_masks[ml] = 0
+            insort(self._ml_values, ml)
+        self._ml_masks[ml] |= bit
+
+        self._slot_of[drink_id] = slot
+        self._ids.append(drink_id)
+        self._glass.append(glass)
+        self._flavor.append(flavor)
+        self._ml.append(ml)
+        self._live |= bit
+
+    def remove(self, drink_id):
+        slot = self._slot_of.pop(drink_id, None)
+        if slot is None:
+            return
+        keep = ~(1 << slot)
+        self._glass_masks[self._glass[slot]] &= keep
+        for word in flavor_words(self._flavors.values[self._flavor[slot]]):
+            self._word_masks[word] &= keep
+        self._ml_masks[self._ml[slot]] &= keep
+        self._ids[slot] = -1
+        self._live &= keep
+
+    def glasses(self):
+        """Copos em uso, do mais ao menos comum: ``[(copo, receitas)]``"""
+        counts = [(value, bin(mask).count("1"))
+                  for value, mask in zip(self._glasses.values, self._glass_masks) if mask and value]
+        return sorted(counts, key=lambda item: (-item[1], item[0]))
+
+    def flavors(self):
+        """Palavras de sabor em uso, da mais à menos comum: ``[(palavra, receitas)]``"""
+        counts = [(self._word_labels[word], bin(mask).count("1"))
+                  for word, mask in self._word_masks.items() if mask]
+        return sorted(counts, key=lambda item: (-item[1], item[0]))
+
+    def glass_mask(self, term):
+        """Receitas cujo copo contém ``term`` ("old-fashioned" casa "Copo old-fashioned")"""
+        term = normalize(term)
+        mask = 0
+        for value, glass_mask in zip(self._glasses.values, self._glass_masks):
+            if term in normalize(value):
+                mask |= glass_mask
+        return mask
+
+    def flavor_mask(self, term):
+        """Receitas com uma palavra de sabor que começa por ``term`` ("citric" casa "cítrico")"""
+        term = normalize(term)
+        mask = 0
+        for word, word_mask in self._word_masks.items():
+            if word.startswith(term):
+                mask |= word_mask
+        return mask
+
+    def ml_mask(self, max_ml):
+        """Receitas com volume até ``max_ml``"""
+        mask = 0
+        for ml in self._ml_values[:bisect_right(self._ml_values, max_ml)]:
+            mask |= self._ml_masks[ml]
+        return mask
+
+    def filter(self, glass=None, flavor=None, max_ml=None):
+        """Ids das receitas que atendem a todos os filtros informados"""
+        mask = self._live
+        if glass:
+            mask &= self.glass_mask(glass)
+        if flavor and mask:
+            mask &= self.flavor_mask(flavor)
+        if max_ml is not None and mask:
+            mask &= self.ml_mask(max_ml)
+        return [self._ids[slot] for slot in _slots_of(mask)]
@@ -0,0 +1,135 @@
+"""Miniaturas em cache e carregamento de imagens em segundo plano.
+
+``ThumbnailCache`` guarda em disco as imagens já redimensionadas, com chave
+pelo caminho de origem, data de modificação e tamanho pedido, para que o
+LANCZOS rode só uma vez por imagem. ``ImageLoader`` decodifica num pool de
+threads e entrega os ``PhotoImage`` prontos na thread do Tk, mantendo os mais
+usados em memória até um limite de bytes.
+
+O Pillow só é importado quando alguma imagem é de fato carregada.
+"""
+import hashlib
+import os
+import queue
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+
+DEFAULT_CACHE_DIR = os.path.join(os.path.expanduser("~"), ".cache", "oguru", "thumbnails")
+
+
+class ThumbnailCache:
+    """Cache em disco de imagens redimensionadas"""
+
+    def __init__(self, cache_dir=DEFAULT_CACHE_DIR):
+        self.cache_dir = cache_dir
+
+    def _cache_path(self, path, size):
+        path = os.path.abspath(path)
+        key = f"{path}|{os.stat(path).st_mtime_ns}|{size[0]}x{size[1]}"
+        return os.path.join(self.cache_dir, hashlib.sha1(key.encode("utf-8")).hexdigest() + ".png")
+
+    def load(self, path, size):
+        """Imagem RGBA de ``path`` cabendo em ``size`` (largura, altura), mantendo a proporção.
+
+        Pode rodar em qualquer thread; um arquivo de origem alterado muda a
+        chave, então miniaturas antigas nunca são reaproveitadas.
+        """
+        from PIL import Image
+
+        cache_path = self._cache_path(path, size)
+        try:
+            with Image.open(cache_path) as cached:
+                return cached.convert("RGBA")
+        except (OSError, ValueError):
+            pass  # Ainda não está em cache (ou arquivo corrompido)
+
+        with Image.open(path) as source:
+            image = source.convert("RGBA")
+        scale = min(size[0] / image.width, size[1] / image.height)
+        image = image.resize((max(1, round(image.width * scale)), max(1, round(image.height * scale))),
+                             Image.LANCZOS)
+        try:
+            os.makedirs(self.cache_dir, exist_ok=True)
+            tmp_path = f"{cache_path}.{os.getpid()}.tmp"
+            image.save(tmp_path, "PNG")
+            os.replace(tmp_path, cache_path)  # Outras threads nunca veem arquivo pela metade
+        except OSError as e:
+            print(f"Erro ao gravar miniatura: {e}")
+        return image
+
+
+class ImageLoader:
+    """Carrega imagens num pool de threads e entrega ``PhotoImage`` na thread do Tk.
+
+    ``request`` nunca bloqueia: se a imagem estiver na memória o callback é
+    chamado na hora; senão a decodificação vai para o pool e o callback roda
+    depois, a partir do loop do Tk. Pedidos repetidos da mesma imagem em
+    andamento são agrupados.
+    """
+
+    def __init__(self, root, cache=None, workers=2, budget_bytes=32 * 1024 * 1024, poll_ms=30):
+        self.root = root
+        self.cache = cache or ThumbnailCache()
+        self.budget_bytes = budget_bytes
+        self.poll_ms = poll_ms
+        self._executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="images")
+        self._done = queue.Queue()
+        self._pending = {}          # chave → callbacks aguardando
+        self._photos = OrderedDict()  # chave → (PhotoImage, bytes), do menos ao mais recente
+        self._used_bytes = 0
+        self._polling = False
+
+    def request(self, path, size, callback):
+        """Pede ``path`` no tamanho ``size``; ``callback(photo)`` recebe None em caso de erro"""
+        key = (os.path.abspath(path), tuple(size))
+        cached = self._photos.get(key)
+        if cached is not None:
+            self._photos.move_to_end(key)
+            callback(cached[0])
+            return
+        if key in self._pending:
+            self._pending[key].append(callback)
+            return
+        self._pending[key] = [callback]
+        self._executor.submit(self._decode, key)
+        if not self._polling:
+            self._polling = True
+            self.root.after(self.poll_ms, self._drain)
+
+    def _decode(self, key):
+        try:
+            image = self.cache.load(*key)
+        except Exception as e:
+            print(f"Erro ao carregar imagem {key[0]}: {e}")
+            image = None
+        self._done.put((key, image))
+
+    def _drain(self):
+        """Converte as imagens decodificadas em ``PhotoImage`` (só pode rodar na thread do Tk)"""
+        while True:
+            try:
+                key, image = self._done.get_nowait()
+            except queue.Empty:
+                break
+            photo = None
+            if image is not None:
+                from PIL import ImageTk
+                photo = ImageTk.PhotoImage(image)
+                self._remember(key, photo, image.width * image.height * 4)
+            for callback in self._pending.pop(key, ()):
+                callback(photo)
+
+        if self._pending:
+            self.root.after(self.poll_ms, self._drain)
+        else:
+            self._polling = False
+
+    def _remember(self, key, photo, size_bytes):
+        self._photos[key] = (photo, size_bytes)
+        self._used_bytes += size_bytes
+        while self._used_bytes > self.budget_bytes and len(self._photos) > 1:
+            _, (_, evicted_bytes) = self._photos.popitem(last=False)
+            self._used_bytes -= evicted_bytes
+
+    def shutdown(self):
+        self._executor.shutdown(wait=False)
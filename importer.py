@@ -0,0 +1,302 @@
+"""Importação em massa de receitas (CSV ou JSONL) para o catálogo.
+
+O arquivo é lido em fluxo, uma receita por vez: cada linha tem as colunas
+mapeadas para os campos do catálogo, é validada (nome, ingredientes e o
+volume ``ml`` conferido com a soma dos ingredientes medidos) e descartada se
+o nome normalizado já existir no catálogo ou tiver aparecido antes no
+arquivo. As receitas aceitas são gravadas em lotes no final do catálogo, então
+a memória usada não cresce com o tamanho do arquivo (só o conjunto de nomes).
+
+    python importer.py fornecedor.csv drinks.jsonl --map "Drink=name"
+"""
+import argparse
+import csv
+import io
+import json
+import os
+import re
+import time
+from collections import Counter
+
+from catalog_store import FIELDS, CatalogError, open_catalog
+from ingredients import UNIT_ML, normalize, parse_ingredients
+
+CHUNK_SIZE = 5000           # receitas por gravação no catálogo
+DEFAULT_TOLERANCE = 0.1     # diferença aceita entre ``ml`` e a soma dos ingredientes
+MAX_PROBLEMS = 50           # linhas rejeitadas listadas no relatório
+
+# Nomes de coluna aceitos para cada campo (já normalizados)
+COLUMN_ALIASES = {
+    "name": ("name", "nome", "drink", "coquetel"),
+    "ingredients": ("ingredients", "ingredientes"),
+    "instructions": ("instructions", "preparo", "modo de preparo", "instrucoes"),
+    "glass": ("glass", "copo"),
+    "garnish": ("garnish", "guarnicao", "decoracao"),
+    "flavor": ("flavor", "sabor"),
+    "appearance": ("appearance", "aparencia"),
+    "ml": ("ml", "volume", "volume ml"),
+}
+
+_ML_RE = re.compile(r"^\s*(\d+(?:[.,]\d+)?)\s*(?:ml)?\s*$", re.IGNORECASE)
+
+
+class ImportReport:
+    """Resumo de ``import_catalog``"""
+
+    def __init__(self):
+        self.imported = 0
+        self.existing = 0             # nome já presente no catálogo
+        self.repeated = 0             # nome repetido dentro do arquivo
+        self.filled_ml = 0            # ``ml`` ausente, preenchido pela soma dos ingredientes
+        self.rejected = Counter()     # motivo → linhas
+        self.problems = []            # "linha N: motivo" das primeiras rejeitadas
+        self.ignored_columns = []
+        self.seconds = 0.0
+
+    def reject(self, line, reason):
+        self.rejected[reason] += 1
+        if len(self.problems) < MAX_PROBLEMS:
+            self.problems.append(f"linha {line}: {reason}")
+
+    def as_text(self):
+        lines = [f"{self.imported} receitas importadas em {self.seconds:.1f} s",
+                 f"{self.existing} já estavam no catálogo",
+                 f"{self.repeated} repetidas no arquivo",
+                 f"{sum(self.rejected.values())} rejeitadas"]
+        lines += [f"  {count:>7}  {reason}" for reason, count in self.rejected.most_common()]
+        if self.filled_ml:
+            lines.append(f"{self.filled_ml} sem volume, calculado pelos ingredientes")
+        if self.ignored_columns:
+            lines.append(f"Colunas ignoradas: {', '.join(self.ignored_columns)}")
+        if self.problems:
+            lines += ["", "Primeiras linhas rejeitadas:"] + [f"  {problem}" for problem in self.problems]
+        return "\n".join(lines)
+
+
+def column_mapping(columns, overrides=None):
+    """Campo do catálogo de cada coluna (None para as que não correspondem a nenhum).
+
+    ``overrides`` (coluna → campo) tem precedência sobre os nomes conhecidos.
+    """
+    overrides = {normalize(column): field for column, field in (overrides or {}).items()}
+    unknown = set(overrides.values()) - set(FIELDS)
+    if unknown:
+        raise CatalogError(f"Campo desconhecido no mapeamento: {', '.join(sorted(unknown))}")
+    known = {alias: field for field, aliases in COLUMN_ALIASES.items() for alias in aliases}
+    mapping = {}
+    for column in columns:
+        key = normalize(str(column).replace("_", " "))
+        mapping[column] = overrides.get(key, known.get(key))
+    return mapping
+
+
+def parse_ml(value):
+    """Volume em ml de ``90``, ``"90ml"`` ou ``"90,5"`` (None se vazio ou inválido)"""
+    if isinstance(value, (int, float)) and not isinstance(value, bool):
+        return float(value)
+    match = _ML_RE.match(str(value or ""))
+    return float(match.group(1).replace(",", ".")) if match else None
+
+
+def _lines(text):
+    """Texto de várias linhas; aceita "|" como separador quando não há quebras"""
+    text = str(text or "").replace("\r\n", "\n").strip()
+    if "\n" not in text and "|" in text:
+        text = "\n".join(part.strip() for part in text.split("|"))
+    return "\n".join(line.strip() for line in text.split("\n") if line.strip())
+
+
+def build_record(row, mapping):
+    """Registro com os ``FIELDS`` a partir de uma linha já mapeada (``ml`` como texto cru)"""
+    record = {field: "" for field in FIELDS}
+    record["ml"] = None
+    for column, value in row.items():
+        field = mapping.get(column)
+        if field is None or value is None:
+            continue
+        if field == "ml":
+            record["ml"] = value
+        elif field in ("ingredients", "instructions"):
+            record[field] = _lines(value)
+        else:
+            record[field] = " ".join(str(value).split())
+    return record
+
+
+def validate_record(record, tolerance=DEFAULT_TOLERANCE):
+    """Confere o registro; devolve o motivo da rejeição ou None.
+
+    ``ml`` vira inteiro. A soma dos ingredientes medidos (ml, dash, colher)
+    não pode passar de ``ml`` além da tolerância; só é exigido que ela chegue
+    a ``ml`` quando todos os ingredientes têm medida, porque itens sem medida
+    ("Água com gás", "1 limão cortado") completam o volume. Sem ``ml``, o
+    volume é a soma, desde que todos os ingredientes tenham medida.
+    """
+    if not record["name"]:
+        return "sem nome"
+    if not record["ingredients"]:
+        return "sem ingredientes"
+
+    measured = 0.0
+    complete = True
+    for item in parse_ingredients(record["ingredients"]):
+        if item.quantity is not None and item.unit in UNIT_ML:
+            measured += item.quantity * UNIT_ML[item.unit]
+        else:
+            complete = False
+
+    raw = record["ml"]
+    if raw is None or str(raw).strip() == "":
+        if not complete:
+            return "sem volume e com ingredientes sem medida"
+        record["ml"] = round(measured)
+        return None
+    ml = parse_ml(raw)
+    if ml is None or ml <= 0:
+        return "volume inválido"
+    record["ml"] = round(ml)
+    if measured > ml * (1 + tolerance):
+        return "ingredientes somam mais que o volume"
+    if complete and measured < ml * (1 - tolerance):
+        return "ingredientes somam menos que o volume"
+    return None
+
+
+def _csv_rows(path):
+    """Linhas do CSV como ``(número da linha, dict, bytes lidos)``"""
+    with open(path, "rb") as raw:
+        sample = raw.read(64 * 1024).decode("utf-8-sig", errors="ignore")
+        raw.seek(0)
+        try:
+            dialect = csv.Sniffer().sniff(sample, delimiters=",;\t")
+        except csv.Error:
+            dialect = csv.excel
+        text = io.TextIOWrapper(raw, encoding="utf-8-sig", newline="")
+        reader = csv.DictReader(text, dialect=dialect)
+        for row in reader:
+            row.pop(None, None)  # Células a mais que o cabeçalho
+            yield reader.line_num, row, raw.tell()
+
+
+def _jsonl_rows(path):
+    """Linhas do JSONL como ``(número da linha, dict, bytes lidos)``; inválidas vêm como None"""
+    with open(path, "rb") as f:
+        position = 0
+        for line_number, line in enumerate(f, 1):
+            position += len(line)
+            if not line.strip():
+                continue
+            try:
+                row = json.loads(line)
+            except ValueError:
+                row = None
+            yield line_number, row if isinstance(row, dict) else None, position
+
+
+def import_catalog(source, catalog_path, existing_names=None, overrides=None,
+                   tolerance=DEFAULT_TOLERANCE, chunk_size=CHUNK_SIZE, progress=None):
+    """Importa as receitas de ``source`` (.csv ou .jsonl) para o final de ``catalog_path``.
+
+    ``existing_names`` são os nomes normalizados já no catálogo (sem ele, o
+    índice do catálogo é lido). ``progress(fração)`` é chamado a cada 1% do
+    arquivo lido, aceitas ou não as receitas. Num catálogo ``.json`` cada
+    lote gravado regrava o arquivo inteiro.
+    """
+    start = time.perf_counter()
+    extension = os.path.splitext(source)[1].lower()
+    if extension == ".csv":
+        rows = _csv_rows(source)
+    elif extension in (".jsonl", ".ndjson"):
+        rows = _jsonl_rows(source)
+    else:
+        raise CatalogError(f"Formato de importação não suportado: {source}")
+    size = os.path.getsize(source) or 1
+
+    report = ImportReport()
+    store = open_catalog(catalog_path)
+    try:
+        if existing_names is None:
+            existing_names = {normalize(entry["name"]) for entry in store.load_index()}
+        existing_names = set(existing_names)
+        seen = set()
+        mapping = {}
+        chunk = []
+        reported = 0
+        step = max(size // 100, 1)
+        for line, row, position in rows:
+            # Pelo que foi lido, não pelo que foi aceito: arquivo só de repetidas também avança
+            if progress is not None and position - reported >= step:
+                reported = position
+                progress(min(position / size, 1.0))
+            if row is None:
+                report.reject(line, "linha inválida")
+                continue
+            if any(column not in mapping for column in row):
+                mapping.update(column_mapping([c for c in row if c not in mapping], overrides))
+                if "name" not in mapping.values() or "ingredients" not in mapping.values():
+                    raise CatalogError(f"{source}: colunas de nome e ingredientes não encontradas "
+                                       f"({', '.join(map(str, row))})")
+                report.ignored_columns = [str(c) for c, field in mapping.items() if field is None]
+
+            record = build_record(row, mapping)
+            missing_ml = record["ml"] is None or str(record["ml"]).strip() == ""
+            problem = validate_record(record, tolerance)
+            if problem is not None:
+                report.reject(line, problem)
+                continue
+            report.filled_ml += missing_ml
+
+            key = normalize(record["name"])
+            if key in existing_names:
+                report.existing += 1
+                continue
+            if key in seen:
+                report.repeated += 1
+                continue
+            seen.add(key)
+            chunk.append(record)
+            if len(chunk) >= chunk_size:
+                store.append_records(chunk)
+                report.imported += len(chunk)
+                chunk = []
+        if chunk:
+            store.append_records(chunk)
+            report.imported += len(chunk)
+        if progress is not None:
+            progress(1.0)
+    finally:
+        store.close()
+    report.seconds = time.perf_counter() - start
+    return report
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Importa receitas de um CSV ou JSONL para o catálogo")
+    parser.add_argument("source", help="arquivo de receitas (.csv ou .jsonl)")
+    parser.add_argument("catalog", help="catálogo de destino (.jsonl, .json ou SQLite)")
+    parser.add_argument("--map", action="append", default=[], metavar="COLUNA=CAMPO",
+                        help="associa uma coluna do arquivo a um campo (ex.: \"Drink=name\")")
+    parser.add_argument("--tolerance", type=float, default=DEFAULT_TOLERANCE,
+                        help="diferença aceita entre ml e a soma dos ingredientes (padrão: 0.1)")
+    args = parser.parse_args()
+
+    overrides = {}
+    for item in args.map:
+        column, separator, field = item.rpartition("=")
+        if not separator:
+            parser.error(f"mapeamento inválido: {item}")
+        overrides[column.strip()] = field.strip()
+
+    def progress(fraction):
+        print(f"\r{fraction:.0%}", end="", flush=True)
+
+    try:
+        report = import_catalog(args.source, args.catalog, overrides=overrides,
+                                tolerance=args.tolerance, progress=progress)
+    except (OSError, CatalogError) as e:
+        parser.exit(1, f"\nErro na importação: {e}\n")
+    print(f"\r{report.as_text()}")
+
+
+if __name__ == "__main__":
+    main()
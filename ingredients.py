@@ -0,0 +1,183 @@
+"""Leitura estruturada das linhas de ingredientes e índice invertido.
+
+Cada linha do campo ``ingredients`` ("30ml de gin", "2 dash de bitters",
+"Água mineral") vira ``(quantidade, unidade, ingrediente)``. O índice guarda,
+para cada ingrediente, um bitmap (um ``int`` do Python) com as receitas que o
+usam, então as consultas são só operações AND/OR entre inteiros.
+"""
+import re
+import unicodedata
+from collections import namedtuple
+
+ParsedIngredient = namedtuple("ParsedIngredient", "quantity unit name")
+
+# Variações aceitas → unidade canônica
+UNITS = {
+    "ml": "ml",
+    "dash": "dash", "dashes": "dash",
+    "colher": "colher", "colheres": "colher",
+    "cubo": "cubo", "cubos": "cubo",
+}
+
+# Conversão das unidades de medida para ml; cubos e itens sem unidade não têm volume
+UNIT_ML = {"ml": 1.0, "dash": 0.9, "colher": 5.0}
+
+# Quantidade: "1 1/2", "1/2", "30" ou "7,5" (frações antes, senão "1/2" casaria só o "1")
+_LINE_RE = re.compile(
+    r"^\s*(?P<quantity>\d+\s+\d+/[1-9]\d*|\d+/[1-9]\d*|\d+(?:[.,]\d+)?)\s*"
+    r"(?:(?P<unit>ml|dash(?:es)?|colher(?:es)?|cubos?)\b\s*)?"
+    r"(?:de\s+)?(?P<name>.*?)\s*$",
+    re.IGNORECASE
+)
+
+
+def normalize(text):
+    """Minúsculas, sem acentos e com espaços simples ("Açúcar" → "acucar")"""
+    decomposed = unicodedata.normalize("NFKD", text.lower())
+    stripped = "".join(c for c in decomposed if not unicodedata.combining(c))
+    return " ".join(stripped.split())
+
+
+def _quantity(text):
+    """Valor de ``30``, ``7,5``, ``1/2`` ou ``1 1/2``"""
+    total = 0.0
+    for part in text.split():
+        numerator, slash, denominator = part.partition("/")
+        total += float(numerator.replace(",", ".")) / (int(denominator) if slash else 1)
+    return total
+
+
+def parse_ingredient_line(line):
+    """Converte uma linha em ``ParsedIngredient``; itens sem medida têm quantidade None.
+
+    Uma linha cujo nome não começaria por letra ("3/4/5 gotas") também fica
+    sem medida, para não virar um ingrediente com o resto do número.
+    """
+    match = _LINE_RE.match(line)
+    if match is None or not match.group("name")[:1].isalpha():
+        return ParsedIngredient(None, None, line.strip())
+    unit = match.group("unit")
+    return ParsedIngredient(
+        _quantity(match.group("quantity")),
+        UNITS[unit.lower()] if unit else None,
+        match.group("name")
+    )
+
+
+def parse_ingredients(text):
+    """Lista de ``ParsedIngredient`` de um campo ``ingredients`` completo"""
+    return [parse_ingredient_line(line) for line in text.split("\n") if line.strip()]
+
+
+def _slots_of(mask):
+    """Posições dos bits ligados, lidas da representação binária (rápido em C)"""
+    bits = bin(mask)[:1:-1]
+    slots = []
+    position = bits.find("1")
+    while position != -1:
+        slots.append(position)
+        position = bits.find("1", position + 1)
+    return slots
+
+
+class IngredientIndex:
+    """Índice invertido ingrediente → receitas.
+
+    As receitas são identificadas pelo ``id`` do catálogo; internamente cada
+    uma ocupa uma posição (bit) fixa nos bitmaps.
+    """
+
+    def __init__(self):
+        self._slot_of = {}       # id da receita → posição do bit
+        self._ids = []           # posição → id (None quando removida)
+        self._keys = []          # posição → ingredientes normalizados da receita
+        self._postings = {}      # ingrediente normalizado → bitmap de receitas
+        self._words = {}         # palavra → ingredientes que a contêm
+        self._live = 0           # bitmap das posições ocupadas
+
+    def __len__(self):
+        return len(self._slot_of)
+
+    @classmethod
+    def from_records(cls, records):
+        index = cls()
+        for record in records:
+            index.add(record["id"], record.get("ingredients"))
+        return index
+
+    def add(self, drink_id, ingredients_text):
+        """Indexa (ou reindexa) as linhas de ingredientes de uma receita"""
+        if drink_id in self._slot_of:
+            self.remove(drink_id)
+        slot = len(self._ids)
+        bit = 1 << slot
+        keys = {normalize(item.name) for item in parse_ingredients(ingredients_text or "")}
+        for key in keys:
+            if key not in self._postings:
+                self._postings[key] = 0
+                for word in key.split():
+                    self._words.setdefault(word, set()).add(key)
+            self._postings[key] |= bit
+        self._slot_of[drink_id] = slot
+        self._ids.append(drink_id)
+        self._keys.append(keys)
+        self._live |= bit
+
+    def remove(self, drink_id):
+        slot = self._slot_of.pop(drink_id, None)
+        if slot is None:
+            return
+        bit = 1 << slot
+        for key in self._keys[slot]:
+            self._postings[key] &= ~bit
+        self._ids[slot] = None
+        self._keys[slot] = ()
+        self._live &= ~bit
+
+    def ingredients(self):
+        """Ingredientes normalizados presentes em alguma receita"""
+        return sorted(key for key, mask in self._postings.items() if mask)
+
+    def resolve(self, term):
+        """Ingredientes que correspondem a um termo da consulta.
+
+        "limão" corresponde a "limao", "suco de limao" e "limao cortado":
+        valem o nome exato ou qualquer ingrediente que contenha todas as
+        palavras do termo.
+        """
+        term = normalize(term)
+        if not term:
+            return set()
+        words = term.split()
+        keys = set(self._words.get(words[0], ()))
+        for word in words[1:]:
+            keys &= self._words.get(word, set())
+        if term in self._postings:
+            keys.add(term)
+        return keys
+
+    def _mask_for(self, term):
+        mask = 0
+        for key in self.resolve(term):
+            mask |= self._postings[key]
+        return mask
+
+    def containing(self, terms):
+        """Ids das receitas que usam todos os ingredientes pedidos"""
+        mask = self._live
+        for term in terms:
+            mask &= self._mask_for(term)
+            if not mask:
+                return []
+        return [self._ids[slot] for slot in _slots_of(mask)]
+
+    def makeable_from(self, shelf):
+        """Ids das receitas feitas só com os ingredientes da prateleira"""
+        available = set()
+        for term in shelf:
+            available |= self.resolve(term)
+        missing = 0
+        for key, mask in self._postings.items():
+            if key not in available:
+                missing |= mask
+        return [self._ids[slot] for slot in _slots_of(self._live & ~missing)]
@@ -0,0 +1,155 @@
+"""Instrumentação opcional da interface (``--instrument``).
+
+Registra o tempo de cada chamada de ``show_drink_list``,
+``show_drink_details`` e ``setup_main_interface``, o atraso do loop de
+eventos do Tk (medido por um ``root.after`` periódico), a quantidade de
+widgets na lista e nos detalhes e a memória residente do processo. Tudo vai
+para um log JSONL com rotação; F12 mostra ou esconde um painel com p50/p99.
+"""
+import functools
+import json
+import logging
+import os
+import sys
+import time
+from collections import deque
+from logging.handlers import RotatingFileHandler
+
+import customtkinter as ctk
+
+TIMED_METHODS = ("show_drink_list", "show_drink_details", "setup_main_interface")
+
+
+def percentile(values, fraction):
+    ordered = sorted(values)
+    if not ordered:
+        return 0.0
+    return ordered[min(len(ordered) - 1, int(fraction * len(ordered)))]
+
+
+def resident_memory_bytes():
+    """Memória residente atual (Linux) ou o pico, onde só ele estiver disponível"""
+    try:
+        with open("/proc/self/statm") as f:
+            return int(f.read().split()[1]) * os.sysconf("SC_PAGE_SIZE")
+    except (OSError, ValueError, AttributeError):
+        pass
+    try:
+        import resource
+    except ImportError:  # Windows
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return peak if sys.platform == "darwin" else peak * 1024
+
+
+def count_widgets(widget):
+    """Widgets Tk abaixo de ``widget`` (inclusive os internos dos componentes ctk)"""
+    children = widget.winfo_children()
+    return len(children) + sum(count_widgets(child) for child in children)
+
+
+class Instrumentation:
+    """Coleta as métricas de um ``DrinkApp`` e mantém o painel de resumo"""
+
+    def __init__(self, app, log_path, heartbeat_ms=100, sample_ms=1000, window=1000,
+                 max_bytes=1024 * 1024, backups=3):
+        self.app = app
+        self.root = app.root
+        self.heartbeat_ms = heartbeat_ms
+        self.sample_ms = sample_ms
+        self.timings = {name: deque(maxlen=window) for name in TIMED_METHODS}
+        self.lag = deque(maxlen=window)
+        self.recent_lag = []       # Atrasos desde a última amostra, que vão inteiros para o log
+        self.last_sample = {}
+        self.overlay = None
+
+        self.logger = logging.getLogger("oguru.instrumentation")
+        self.logger.setLevel(logging.INFO)
+        self.logger.propagate = False
+        handler = RotatingFileHandler(log_path, maxBytes=max_bytes, backupCount=backups,
+                                      encoding="utf-8")
+        handler.setFormatter(logging.Formatter("%(message)s"))
+        self.logger.addHandler(handler)
+
+    def start(self):
+        for name in TIMED_METHODS:
+            setattr(self.app, name, self._timed(name, getattr(self.app, name)))
+        self._expected = time.perf_counter() + self.heartbeat_ms / 1000
+        self.root.after(self.heartbeat_ms, self._heartbeat)
+        self.root.after(self.sample_ms, self._sample)
+        self.root.bind("<F12>", lambda event: self.toggle_overlay())
+        return self
+
+    def _log(self, record):
+        record["t"] = round(time.time(), 3)
+        self.logger.info(json.dumps(record))
+
+    def _timed(self, name, method):
+        @functools.wraps(method)
+        def wrapper(*args, **kwargs):
+            start = time.perf_counter()
+            try:
+                return method(*args, **kwargs)
+            finally:
+                elapsed = (time.perf_counter() - start) * 1000
+                self.timings[name].append(elapsed)
+                self._log({"event": "call", "name": name, "ms": round(elapsed, 3)})
+        return wrapper
+
+    def _heartbeat(self):
+        """Quanto o callback atrasou em relação ao horário agendado"""
+        now = time.perf_counter()
+        lag = max(0.0, (now - self._expected) * 1000)
+        self.lag.append(lag)
+        self.recent_lag.append(round(lag, 1))
+        if lag > self.heartbeat_ms:  # Só travadas perceptíveis vão para o log
+            self._log({"event": "lag", "ms": round(lag, 1)})
+        self._expected = now + self.heartbeat_ms / 1000
+        self.root.after(self.heartbeat_ms, self._heartbeat)
+
+    def _sample(self):
+        sample = {"event": "sample", "rss_bytes": resident_memory_bytes(),
+                  "lag_p50_ms": round(percentile(self.lag, 0.5), 1),
+                  "lag_p99_ms": round(percentile(self.lag, 0.99), 1),
+                  "lags_ms": self.recent_lag}
+        self.recent_lag = []
+        for name in ("drink_list_frame", "drink_details"):
+            widget = getattr(self.app, name, None)
+            if widget is not None:
+                sample[f"widgets_{name}"] = count_widgets(widget)
+        self.last_sample = sample
+        self._log(dict(sample))
+        if self.overlay is not None:
+            self._refresh_overlay()
+        self.root.after(self.sample_ms, self._sample)
+
+    def summary_lines(self):
+        lines = []
+        for name, values in self.timings.items():
+            if values:
+                lines.append(f"{name}: p50 {percentile(values, 0.5):.1f} / "
+                             f"p99 {percentile(values, 0.99):.1f} ms (n={len(values)})")
+        lines.append(f"atraso do loop: p50 {percentile(self.lag, 0.5):.1f} / "
+                     f"p99 {percentile(self.lag, 0.99):.1f} ms")
+        for name in ("drink_list_frame", "drink_details"):
+            if f"widgets_{name}" in self.last_sample:
+                lines.append(f"widgets em {name}: {self.last_sample[f'widgets_{name}']}")
+        rss = self.last_sample.get("rss_bytes")
+        if rss:
+            lines.append(f"memória: {rss / 1024 / 1024:.1f} MB")
+        return lines
+
+    def toggle_overlay(self):
+        if self.overlay is not None:
+            self.overlay.destroy()
+            self.overlay = None
+            return
+        self.overlay = ctk.CTkLabel(self.root, text="", justify="left", anchor="w",
+                                    font=("Courier", 11), fg_color="#000000",
+                                    text_color="#76FF03", corner_radius=6)
+        self.overlay.place(relx=1.0, x=-15, y=15, anchor="ne")
+        self._refresh_overlay()
+
+    def _refresh_overlay(self):
+        self.overlay.configure(text="\n".join(self.summary_lines()))
+        self.overlay.lift()
@@ -1,12 +1,42 @@
+import time
+_START_TIME = time.perf_counter()  # Referência para o tempo até a interface ficar interativa
+
+import argparse
+from collections import OrderedDict
 import customtkinter as ctk
-from tkinter import messagebox
 from PIL import Image, ImageTk
+from tkinter import filedialog, messagebox
 import os
-import time
+import queue
+import threading
+
+from catalog_store import CatalogError
+from catalog_watcher import CatalogWatcher
+from drink_model import DrinkCatalog, format_drink_details
+from image_cache import ImageLoader, ThumbnailCache
+from ingredients import normalize
+from order_queue import OrderListener, drain
+
+BASE_DIR = os.path.dirname(os.path.abspath(__file__))
+
+# Catálogo padrão: arquivo JSONL ao lado do script (também aceita .json ou SQLite)
+DEFAULT_CATALOG = os.path.join(BASE_DIR, "drinks.jsonl")
+
+# Fotos dos drinks: images/<nome-normalizado>.png|.jpg (ex.: images/pina-colada.jpg)
+IMAGES_DIR = os.path.join(BASE_DIR, "images")
+
+# Tempo mínimo da tela de abertura (a duração do fade); 0 desativa
+DEFAULT_MIN_SPLASH_MS = 1000
 
 class DrinkApp:
-    def __init__(self, root):
+    def __init__(self, root, catalog_path=DEFAULT_CATALOG, min_splash_ms=DEFAULT_MIN_SPLASH_MS,
+                 order_port=None, order_spool=None, instrument_log=None, watch_catalog=True,
+                 api_port=None):
         self.root = root
+        self.catalog_path = catalog_path
+        self.catalog = DrinkCatalog(catalog_path)
+        self.drinks = []
+        self.min_splash_ms = min_splash_ms
         self.root.title("Oguru Sushi & Bar - Classic Cocktails")
         self.root.geometry("1000x700")
         self.root.resizable(False, False)
@@ -27,67 +57,188 @@ class DrinkApp:
         self.text_color = "#FFFFFF"
         self.drink_name_color = "#000000"  # Preto
         
-        # Carregar logo
-        self.load_logo()
+        # Lista virtualizada: altura de cada linha (botão de 40px + pady de 5px)
+        # e linhas extras mantidas no pool além das que cabem na tela
+        self.list_row_height = 50
+        self.list_buffer_rows = 2
+        self.list_offset = 0
+        self.list_buttons = []
+        self.visible_drinks = []
+        
+        # Painel de detalhes: pool de seções (frame + labels) reconfiguradas a cada clique
+        self.detail_sections = []
+        
+        # Drinks parecidos: tabela pré-calculada em segundo plano, botões fixos no painel
+        self.similar_count = 4
+        self.similar_buttons = []
+        
+        # Índices do catálogo montados em segundo plano depois da abertura
+        self._building_indexes = set()
+        
+        # Imagens: miniaturas em cache no disco, decodificadas em segundo plano
+        self.thumbnail_cache = ThumbnailCache()
+        self.image_loader = ImageLoader(self.root, self.thumbnail_cache)
+        self.drink_photo_size = (240, 240)
+        self._photo_placeholder = None
+        self._current_drink_id = None
+        self._reopen_after_reload = None  # Drink pedido enquanto o arquivo estava sendo salvo
+        
+        # Fechamento do dia: matriz de volumes montada na primeira vez
+        self.consumption_engine = None
+        
+        # Importação de receitas: progresso enviado pela thread e lido pelo loop do Tk
+        self.import_progress = queue.Queue()
+        self.import_poll_ms = 100
+        self._importing = False
+        
+        # Fila de pedidos do PDV (desativada se não houver porta nem pasta de spool)
+        self.order_port = order_port
+        self.order_spool = order_spool
+        self.order_listener = None
+        self.order_inbox = queue.Queue()
+        self.pending_orders = OrderedDict()  # id do pedido → Order, do mais antigo ao mais novo
+        self.order_poll_ms = 100
+        self.order_batch_limit = 500
+        self.order_panel_rows = 12
+        self.order_rows = []
+        self.order_panel = None
+        
+        # API HTTP somente leitura para os tablets (desativada sem porta)
+        self.api_port = api_port
+        self.catalog_server = None
+        
+        # Recarga do catálogo quando o arquivo muda em disco
+        self.watch_catalog = watch_catalog
+        self.catalog_watcher = None
+        self.catalog_reloads = queue.Queue()
+        self.catalog_poll_ms = 500
+        
+        # Filtros da lista: ids do filtro de ingredientes e atraso da busca entre teclas
+        self.ingredient_filter_ids = None
+        self.facet_filter_ids = None
+        self.all_glasses_label = "Todos os copos"
+        self.all_flavors_label = "Todo sabor"
+        self.volume_limits = {"Todo volume": None, "Até 100 ml": 100, "Até 120 ml": 120,
+                              "Até 150 ml": 150, "Até 200 ml": 200}
+        self.chip_options = 12
+        self.search_debounce_ms = 150
+        self._search_after_id = None
+        
+        # Abertura: logo e catálogo são carregados em segundo plano e a
+        # interface principal aparece assim que estiverem prontos
+        self.logo_path = "oguru.png"
+        self.logo_photo = None
+        self.fade_steps = 20
+        self.fade_interval_ms = 50
+        self.fade_frames = []
+        self.time_to_interactive_ms = None
+        self._splash_start = time.perf_counter()
+        self._startup_queue = queue.Queue()
+        self._startup_result = None
+        
+        # Instrumentação opcional: tempos, atraso do loop, widgets e memória
+        self.instrumentation = None
+        if instrument_log:
+            from instrumentation import Instrumentation
+            self.instrumentation = Instrumentation(self, instrument_log).start()
         
         # Tela de abertura
         self.show_splash_screen()
         
-        # Após a animação, configurar a interface principal
-        self.root.after(2000, self.setup_main_interface)
+        threading.Thread(target=self._load_startup_assets, daemon=True).start()
+        self.root.after(16, self._poll_startup)
     
     def load_logo(self):
+        """Decodifica o logo e pré-calcula os quadros do fade (fora da thread da interface).
+        
+        Devolve ``(logo, quadros)``: o logo com transparência, para a barra
+        lateral, e os quadros já misturados com o fundo da abertura.
+        """
+        if not os.path.exists(self.logo_path):
+            return None, []
+        
+        # Largura de 200px; a miniatura redimensionada fica em cache entre execuções
+        logo = self.thumbnail_cache.load(self.logo_path, (200, 400))
+        
+        # Fade real: o logo sobre o fundo, misturado com o fundo liso em cada quadro
+        background = Image.new("RGBA", logo.size, self.bg_color)
+        opaque = Image.alpha_composite(background, logo)
+        return logo, [Image.blend(background, opaque, (step + 1) / self.fade_steps)
+                      for step in range(self.fade_steps)]
+    
+    def _load_startup_assets(self):
+        """Thread de abertura: logo primeiro (para o fade) e depois o catálogo"""
         try:
-            logo_path = "oguru.png"
-            if os.path.exists(logo_path):
-                self.logo_image = Image.open(logo_path)
-                max_width = 200
-                width_percent = (max_width / float(self.logo_image.size[0]))
-                height_size = int((float(self.logo_image.size[1]) * float(width_percent)))
-                self.logo_image = self.logo_image.resize((max_width, height_size), Image.LANCZOS)
-                self.logo_photo = ImageTk.PhotoImage(self.logo_image)
-            else:
-                self.logo_photo = None
+            self._startup_queue.put(("logo", self.load_logo()))
         except Exception as e:
             print(f"Erro ao carregar logo: {e}")
-            self.logo_photo = None
+            self._startup_queue.put(("logo", (None, [])))
+        
+        try:
+            drinks = self.load_classic_drinks_data()
+            self._startup_queue.put(("catalog", drinks))
+        except (OSError, CatalogError) as e:
+            self._startup_queue.put(("error", e))
+    
+    def _poll_startup(self):
+        """Recebe os resultados da thread de abertura no loop do Tk"""
+        while True:
+            try:
+                kind, value = self._startup_queue.get_nowait()
+            except queue.Empty:
+                break
+            if kind == "logo":
+                self._start_logo_fade(*value)
+            elif kind == "catalog":
+                self._startup_result = value
+            else:
+                messagebox.showerror("Catálogo", f"Erro ao carregar catálogo:\n{value}")
+                self._startup_result = self.catalog.drinks  # Vazio até o arquivo ser corrigido
+        
+        elapsed_ms = (time.perf_counter() - self._splash_start) * 1000
+        if self._startup_result is not None and elapsed_ms >= self.min_splash_ms:
+            self.setup_main_interface()
+        else:
+            self.root.after(16, self._poll_startup)
     
     def show_splash_screen(self):
         # Frame de abertura
         self.splash_frame = ctk.CTkFrame(self.root, fg_color=self.bg_color)
         self.splash_frame.pack(fill="both", expand=True)
         
-        # Logo com transparência inicial
-        if self.logo_photo:
-            self.splash_logo = ctk.CTkLabel(self.splash_frame, image=self.logo_photo, text="")
-            self.splash_logo.pack(pady=(200, 0))
-            self.splash_logo.configure(text_color=self.bg_color)  # Inicia transparente
+        # Texto com a cor do fundo até o fade começar; se houver logo, a
+        # imagem substitui o texto quando os quadros ficarem prontos
+        self.splash_logo = ctk.CTkLabel(self.splash_frame, text="OGURU\nSUSHI & BAR", 
+                                       font=self.title_font, text_color=self.bg_color)
+        self.splash_logo.pack(pady=(200, 0))
+    
+    def _start_logo_fade(self, logo, images):
+        if images:
+            # Convertidos uma vez; os quadros têm o fundo da abertura, então a
+            # barra lateral (outra cor) usa o logo original, com transparência
+            self.fade_frames = [ImageTk.PhotoImage(image) for image in images]
+            self.logo_photo = ImageTk.PhotoImage(logo)
         else:
-            self.splash_logo = ctk.CTkLabel(self.splash_frame, text="OGURU\nSUSHI & BAR", 
-                                           font=self.title_font, text_color=self.accent_color)
-            self.splash_logo.pack(pady=(200, 0))
-        
-        # Animação de fade-in
+            self.fade_frames = self._precompute_fade_colors()
         self.fade_in()
     
-    def fade_in(self, alpha=0):
-        """Animação de aparecimento gradual do logo"""
-        if alpha < 1:
-            alpha += 0.05  # Incremento da transparência
-            if self.logo_photo:
-                # Para imagens, usamos uma abordagem diferente
-                self.splash_logo.configure(text_color=self._get_fade_color(alpha))
-            else:
-                # Para texto, ajustamos a cor diretamente
-                r, g, b = self._hex_to_rgb(self.accent_color)
-                faded_color = self._rgb_to_hex(
-                    int(r * alpha),
-                    int(g * alpha),
-                    int(b * alpha)
-                )
-                self.splash_logo.configure(text_color=faded_color)
-            
-            self.root.after(50, lambda: self.fade_in(alpha))
+    def _precompute_fade_colors(self):
+        """Cores do texto do fade, do fundo até a cor de destaque"""
+        background = self._hex_to_rgb(self.bg_color)
+        accent = self._hex_to_rgb(self.accent_color)
+        return [self._get_fade_color((step + 1) / self.fade_steps, background, accent)
+                for step in range(self.fade_steps)]
+    
+    def fade_in(self, step=0):
+        """Animação de aparecimento gradual do logo, usando os quadros pré-calculados"""
+        if self.splash_frame is None or step >= len(self.fade_frames):
+            return  # Interface principal já montada ou animação concluída
+        frame = self.fade_frames[step]
+        if self.logo_photo:
+            self.splash_logo.configure(image=frame, text="")
+        else:
+            self.splash_logo.configure(text_color=frame)
+        self.root.after(self.fade_interval_ms, lambda: self.fade_in(step + 1))
     
     def _hex_to_rgb(self, hex_color):
         """Converte cor hex para RGB"""
@@ -98,10 +249,10 @@ class DrinkApp:
         """Converte RGB para hex"""
         return f"#{r:02x}{g:02x}{b:02x}"
     
-    def _get_fade_color(self, alpha):
+    def _get_fade_color(self, alpha, background, accent):
         """Calcula cor intermediária para fade-in"""
-        bg_r, bg_g, bg_b = self._hex_to_rgb(self.bg_color)
-        fg_r, fg_g, fg_b = self._hex_to_rgb(self.accent_color)
+        bg_r, bg_g, bg_b = background
+        fg_r, fg_g, fg_b = accent
         
         r = int(bg_r + (fg_r - bg_r) * alpha)
         g = int(bg_g + (fg_g - bg_g) * alpha)
@@ -112,6 +263,7 @@ class DrinkApp:
     def setup_main_interface(self):
         # Remover tela de abertura
         self.splash_frame.destroy()
+        self.splash_frame = None
         
         # Frame principal
         self.main_frame = ctk.CTkFrame(self.root, fg_color=self.bg_color)
@@ -134,10 +286,113 @@ class DrinkApp:
                                          font=self.title_font, text_color=self.accent_color)
             self.logo_label.pack()
         
-        # Lista de drinks
-        self.drink_list_frame = ctk.CTkScrollableFrame(self.sidebar, fg_color=self.frame_color)
+        # Busca por nome e filtro por ingredientes ("gin, limão")
+        self.filter_frame = ctk.CTkFrame(self.sidebar, fg_color="transparent")
+        self.filter_frame.pack(fill="x", padx=10, pady=(0, 10))
+        
+        self.search_entry = ctk.CTkEntry(self.filter_frame, font=self.normal_font,
+                                        placeholder_text="🔍 Buscar drink")
+        self.search_entry.pack(fill="x", pady=(0, 5))
+        self.search_entry.bind("<KeyRelease>", self._schedule_search)
+        
+        # Filtro por ingredientes (ativado quando o índice fica pronto)
+        self.ingredient_entry = ctk.CTkEntry(self.filter_frame, font=self.normal_font,
+                                            placeholder_text="Ingredientes: gin, limão",
+                                            state="disabled")
+        self.ingredient_entry.pack(fill="x")
+        self.ingredient_entry.bind("<Return>", lambda e: self.apply_ingredient_filter())
+        
+        self.ingredient_mode = ctk.CTkSegmentedButton(
+            self.filter_frame,
+            values=["Contém", "Só com estes"],
+            command=lambda value: self.apply_ingredient_filter(),
+            selected_color=self.accent_color,
+            selected_hover_color="#64DD17",
+            text_color=self.drink_name_color,
+            font=self.normal_font,
+            state="disabled"
+        )
+        self.ingredient_mode.set("Contém")
+        self.ingredient_mode.pack(fill="x", pady=(5, 0))
+        
+        # Chips de copo, sabor e volume (ativados quando o índice fica pronto)
+        self.chips_frame = ctk.CTkFrame(self.filter_frame, fg_color="transparent")
+        self.chips_frame.pack(fill="x", pady=(5, 0))
+        self.chips_frame.grid_columnconfigure((0, 1), weight=1, uniform="chips")
+        
+        chip_style = dict(command=self.apply_facet_filter, fg_color="#333333",
+                          button_color="#444444", button_hover_color="#555555",
+                          font=self.normal_font, dynamic_resizing=False, height=28,
+                          state="disabled")
+        self.glass_chip = ctk.CTkOptionMenu(self.chips_frame, values=[self.all_glasses_label],
+                                            **chip_style)
+        self.glass_chip.grid(row=0, column=0, columnspan=2, sticky="ew")
+        self.flavor_chip = ctk.CTkOptionMenu(self.chips_frame, values=[self.all_flavors_label],
+                                             width=100, **chip_style)
+        self.flavor_chip.grid(row=1, column=0, sticky="ew", padx=(0, 3), pady=(5, 0))
+        self.volume_chip = ctk.CTkOptionMenu(self.chips_frame, values=list(self.volume_limits),
+                                             width=100, **chip_style)
+        self.volume_chip.grid(row=1, column=1, sticky="ew", padx=(3, 0), pady=(5, 0))
+        
+        # Ações, fixas no rodapé da barra lateral
+        self.actions_frame = ctk.CTkFrame(self.sidebar, fg_color="transparent")
+        self.actions_frame.pack(side="bottom", fill="x", padx=10, pady=(0, 15))
+        
+        self.report_button = ctk.CTkButton(
+            self.actions_frame,
+            text="📊 Fechamento do dia",
+            command=self.open_consumption_report,
+            fg_color="#333333",
+            hover_color="#444444",
+            corner_radius=10,
+            font=self.normal_font,
+            height=32
+        )
+        self.report_button.pack(fill="x")
+        
+        self.cards_button = ctk.CTkButton(
+            self.actions_frame,
+            text="🖨️ Cartões de receita",
+            command=self.export_recipe_cards,
+            fg_color="#333333",
+            hover_color="#444444",
+            corner_radius=10,
+            font=self.normal_font,
+            height=32
+        )
+        self.cards_button.pack(fill="x", pady=(5, 0))
+        
+        self.import_button = ctk.CTkButton(
+            self.actions_frame,
+            text="📥 Importar receitas",
+            command=self.import_recipes,
+            fg_color="#333333",
+            hover_color="#444444",
+            corner_radius=10,
+            font=self.normal_font,
+            height=32
+        )
+        self.import_button.pack(fill="x", pady=(5, 0))
+        
+        # Progresso da importação (só aparece enquanto ela roda)
+        self.import_progress_bar = ctk.CTkProgressBar(self.actions_frame, height=8,
+                                                      progress_color=self.accent_color)
+        self.import_progress_bar.set(0)
+        
+        # Lista de drinks (virtualizada: pool fixo de botões reaproveitados na rolagem)
+        self.drink_list_frame = ctk.CTkFrame(self.sidebar, fg_color=self.frame_color, width=210)
         self.drink_list_frame.pack(fill="both", expand=True, padx=10, pady=(0, 20))
         
+        self.drink_list_scrollbar = ctk.CTkScrollbar(self.drink_list_frame, 
+                                                    command=self._on_list_scrollbar)
+        self.drink_list_scrollbar.pack(side="right", fill="y")
+        
+        self.drink_list_rows = ctk.CTkFrame(self.drink_list_frame, fg_color="transparent", width=190)
+        self.drink_list_rows.pack(side="left", fill="both", expand=True)
+        self.drink_list_rows.pack_propagate(False)  # Linhas extras do buffer ficam recortadas
+        self.drink_list_rows.bind("<Configure>", self._on_list_resize)
+        self._bind_list_mousewheel(self.drink_list_rows)
+        
         # Área de conteúdo principal
         self.content_frame = ctk.CTkFrame(self.main_frame, fg_color=self.frame_color, 
                                         corner_radius=20)
@@ -152,231 +407,591 @@ class DrinkApp:
         self.drink_details = ctk.CTkScrollableFrame(self.content_frame, fg_color=self.frame_color)
         self.drink_details.pack(fill="both", expand=True, padx=20, pady=(0, 20))
         
+        # Foto do drink (só aparece para drinks que têm imagem)
+        self.detail_photo = ctk.CTkLabel(self.drink_details, text="")
+        self.detail_photo.packed = False
+        
+        # Drinks parecidos (aparece quando a tabela de similaridade fica pronta)
+        self.similar_frame = ctk.CTkFrame(self.content_frame, fg_color="transparent")
+        self.similar_frame.packed = False
+        self.similar_label = ctk.CTkLabel(self.similar_frame, text="🔗 Parecidos:",
+                                         font=self.normal_font, text_color=self.text_color)
+        self.similar_label.pack(side="left", padx=(0, 5))
+        for slot in range(self.similar_count):
+            button = ctk.CTkButton(
+                self.similar_frame,
+                text="",
+                command=lambda s=slot: self._on_similar_button(s),
+                fg_color="#333333",
+                hover_color="#444444",
+                corner_radius=10,
+                font=self.normal_font,
+                height=28,
+                width=120
+            )
+            button.drink_id = None
+            button.bound_text = None
+            button.packed = False
+            self.similar_buttons.append(button)
+        
         # Rodapé
         self.footer = ctk.CTkLabel(self.content_frame, text="© 2025 Oguru Sushi & Bar - Premium Cocktails", 
                                   font=("Helvetica", 10), text_color="#AAAAAA")
         self.footer.pack(pady=10)
         
-        # Carregar dados dos drinks
-        self.drinks = self.load_classic_drinks_data()
+        # Dados dos drinks já carregados pela thread de abertura; é a mesma
+        # lista do catálogo, alterada no lugar pelas recargas
+        self.drinks = self.catalog.drinks
         self.show_drink_list()
+        
+        if self.order_port is not None or self.order_spool is not None:
+            self.start_order_queue()
+        
+        if self.api_port is not None:
+            self.start_catalog_api()
+        
+        if self.watch_catalog:
+            self.catalog_watcher = CatalogWatcher(self.catalog, self.catalog_reloads).start()
+            self.root.after(self.catalog_poll_ms, self._apply_catalog_reloads)
+        
+        self.root.after_idle(self._report_time_to_interactive)
+        self.root.after_idle(self._build_catalog_indexes)
+    
+    def _report_time_to_interactive(self):
+        """Mede do início do processo até a interface principal desenhada"""
+        self.time_to_interactive_ms = (time.perf_counter() - _START_TIME) * 1000
+        print(f"Interface pronta em {self.time_to_interactive_ms:.0f} ms")
+    
+    def _build_catalog_indexes(self):
+        """Monta os índices que faltam: ingredientes, copo/sabor/volume e drinks parecidos.
+        
+        Se o catálogo não abriu, nada é montado; a primeira recarga do
+        observador com o arquivo corrigido chama este método de novo.
+        """
+        if self.catalog.store is None:
+            return
+        if self.catalog.ingredient_index is None:
+            self.ingredient_entry.configure(state="disabled")
+            self.ingredient_mode.configure(state="disabled")
+            self._build_catalog_index("ingredient_index", self.catalog.build_ingredient_index,
+                                      self._on_ingredients_ready, "Ingredientes")
+        if self.catalog.facet_index is None:
+            self._build_catalog_index("facet_index", self.catalog.build_facet_index,
+                                      self._refresh_facet_chips, "Filtros")
+        if self.catalog.similarity_index is None:
+            self._build_catalog_index("similarity_index", self.catalog.build_similarity_index,
+                                      self._on_similarity_ready, "Drinks parecidos")
+    
+    def _build_catalog_index(self, attribute, build, on_ready, error_title):
+        """Monta um índice do catálogo em segundo plano (remontado se o catálogo mudar no meio)"""
+        if attribute in self._building_indexes:
+            return
+        self._building_indexes.add(attribute)
+        generation = self.catalog.generation
+        
+        def work():
+            try:
+                return build()
+            except Exception:
+                if self.catalog.generation != generation:
+                    return None  # Catálogo recarregado no meio da leitura
+                raise
+        
+        def done(index):
+            self._building_indexes.discard(attribute)
+            if self.catalog.generation != generation:
+                if getattr(self.catalog, attribute) is None:  # Catálogo trocado já pode trazer o índice
+                    self._build_catalog_index(attribute, build, on_ready, error_title)
+                return
+            setattr(self.catalog, attribute, index)
+            on_ready()
+        
+        def failed(error):
+            self._building_indexes.discard(attribute)
+        
+        self.run_in_background(work, done, error_title=error_title, on_error=failed)
+    
+    def _on_ingredients_ready(self):
+        self.ingredient_entry.configure(state="normal")
+        self.ingredient_mode.configure(state="normal")
+        if self.ingredient_entry.get().strip():  # Filtro digitado antes da troca do catálogo
+            self.apply_ingredient_filter()
+    
+    def _on_similarity_ready(self):
+        if self._current_drink_id is not None:
+            self._show_similar(self._current_drink_id)
     
     def load_classic_drinks_data(self):
-        drinks = [
-              {
-                "name": "Negroni",
-                "ingredients": "30ml de gin\n30ml de Campari\n30ml de vermute doce",
-                "instructions": "Misture todos os ingredientes em um copo mixing com gelo.\nMexa bem por 30 segundos.\nCoe em um copo old-fashioned com gelo.\nDecore com casca de laranja.",
-                "glass": "Copo old-fashioned",
-                "garnish": "Casca de laranja",
-                "flavor": "Amargo e herbal",
-                "appearance": "Vermelho profundo",
-                "ml": 90
-            },
-            {
-                "name": "Old Fashioned",
-                "ingredients": "60ml de bourbon\n1 cubo de açúcar\n2 dash de bitters\nÁgua mineral",
-                "instructions": "Coloque o cubo de açúcar no copo.\nAdicione os bitters e um pouco de água.\nMacere até dissolver o açúcar.\nAdicione gelo e o bourbon.\nMexa suavemente.\nDecore com casca de laranja e cereja.",
-                "glass": "Copo old-fashioned",
-                "garnish": "Casca de laranja e cereja",
-                "flavor": "Doce e aromático",
-                "appearance": "Âmbar",
-                "ml": 90
-            },
-            {
-                "name": "Martini",
-                "ingredients": "60ml de gin\n10ml de vermute seco",
-                "instructions": "Misture os ingredientes em uma coqueteleira com gelo.\nMexa por 30 segundos.\nCoe em uma taça de martini resfriada.\nDecore com azeitonas ou casca de limão.",
-                "glass": "Taça de martini",
-                "garnish": "Azeitona ou casca de limão",
-                "flavor": "Seco e herbal",
-                "appearance": "Cristalino",
-                "ml": 70
-            },
-            {
-                "name": "Mojito",
-                "ingredients": "50ml de rum branco\n6 folhas de hortelã\n25ml de suco de limão\n2 colheres de açúcar\nÁgua com gás",
-                "instructions": "Macere as folhas de hortelã com o açúcar e suco de limão.\nAdicione o rum e gelo picado.\nComplete com água com gás.\nMexa suavemente.\nDecore com hortelã e rodela de limão.",
-                "glass": "Copo highball",
-                "garnish": "Hortelã e limão",
-                "flavor": "Refrescante e mentolado",
-                "appearance": "Translúcido com folhas",
-                "ml": 200
-            },
-            {
-                "name": "Margarita",
-                "ingredients": "50ml de tequila\n25ml de Cointreau\n25ml de suco de limão\nSal",
-                "instructions": "Umedeça a borda da taça com limão e mergulhe em sal.\nMisture todos os ingredientes na coqueteleira com gelo.\nAgite vigorosamente.\nCoe na taça com ou sem gelo.\nDecore com rodela de limão.",
-                "glass": "Taça de margarita",
-                "garnish": "Rodela de limão",
-                "flavor": "Doce e azedo",
-                "appearance": "Amarelo pálido",
-                "ml": 100
-            },
-            {
-                "name": "Piña Colada",
-                "ingredients": "60ml de rum branco\n90ml de suco de abacaxi\n30ml de leite de coco",
-                "instructions": "Bata todos os ingredientes no liquidificador com gelo.\nSirva em um copo hurricane.\nDecore com fatia de abacaxi e cereja.",
-                "glass": "Copo hurricane",
-                "garnish": "Abacaxi e cereja",
-                "flavor": "Tropical e cremoso",
-                "appearance": "Branco cremoso",
-                "ml": 180
-            },
-            {
-                "name": "Daiquiri",
-                "ingredients": "60ml de rum branco\n25ml de suco de limão\n15ml de xarope simples",
-                "instructions": "Misture todos os ingredientes na coqueteleira com gelo.\nAgite vigorosamente.\nCoe em uma taça de cocktail.\nDecore com rodela de limão.",
-                "glass": "Taça de cocktail",
-                "garnish": "Rodela de limão",
-                "flavor": "Doce e azedo",
-                "appearance": "Cristalino",
-                "ml": 100
-            },
-            {
-                "name": "Whiskey Sour",
-                "ingredients": "60ml de bourbon\n25ml de suco de limão\n15ml de xarope simples\n1 clara de ovo",
-                "instructions": "Agite todos os ingredientes sem gelo para emulsificar.\nAdicione gelo e agite novamente.\nCoe em um copo old-fashioned com gelo.\nDecore com bitters e casca de limão.",
-                "glass": "Copo old-fashioned",
-                "garnish": "Casca de limão",
-                "flavor": "Equilibrado",
-                "appearance": "Espumoso",
-                "ml": 100
-            },
-            {
-                "name": "Manhattan",
-                "ingredients": "60ml de whiskey\n30ml de vermute doce\n2 dash de bitters",
-                "instructions": "Misture todos os ingredientes em um copo mixing com gelo.\nMexa por 30 segundos.\nCoe em uma taça de cocktail.\nDecore com cereja.",
-                "glass": "Taça de cocktail",
-                "garnish": "Cereja",
-                "flavor": "Complexo e aromático",
-                "appearance": "Âmbar avermelhado",
-                "ml": 90
-            },
-            {
-                "name": "Moscow Mule",
-                "ingredients": "50ml de vodka\n15ml de suco de limão\n120ml de cerveja de gengibre",
-                "instructions": "Adicione vodka e suco de limão em um copo mule com gelo.\nComplete com cerveja de gengibre.\nMexa suavemente.\nDecore com fatia de limão.",
-                "glass": "Copo de cobre (mule cup)",
-                "garnish": "Fatia de limão",
-                "flavor": "Refrescante e picante",
-                "appearance": "Translúcido",
-                "ml": 185
-            },
-            {
-                "name": "Aperol Spritz",
-                "ingredients": "90ml de prosecco\n60ml de Aperol\n30ml de água com gás",
-                "instructions": "Encha um copo wine com gelo.\nAdicione o prosecco primeiro.\nAcrescente o Aperol.\nComplete com água com gás.\nDecore com rodela de laranja.",
-                "glass": "Copo wine",
-                "garnish": "Rodela de laranja",
-                "flavor": "Amargo e frutado",
-                "appearance": "Laranja vibrante",
-                "ml": 180
-            },
-            {
-                "name": "Espresso Martini",
-                "ingredients": "50ml de vodka\n30ml de licor de café\n30ml de café espresso\n15ml de xarope simples",
-                "instructions": "Agite todos os ingredientes vigorosamente com gelo.\nCoe em uma taça de martini.\nDecore com grãos de café.",
-                "glass": "Taça de martini",
-                "garnish": "Grãos de café",
-                "flavor": "Energético e doce",
-                "appearance": "Marrom escuro com espuma",
-                "ml": 125
-            },
-            {
-                "name": "Gin Tonic",
-                "ingredients": "50ml de gin\n150ml de água tônica",
-                "instructions": "Encha um copo balloon com gelo.\nAdicione o gin.\nComplete com água tônica.\nMexa suavemente.\nDecore com fatia de limão ou ervas.",
-                "glass": "Copo balloon",
-                "garnish": "Limão ou ervas",
-                "flavor": "Refrescante e herbal",
-                "appearance": "Translúcido",
-                "ml": 200
-            },
-            {
-                "name": "Bloody Mary",
-                "ingredients": "50ml de vodka\n120ml de suco de tomate\n15ml de suco de limão\n2 dash de molho inglês\n2 dash de tabasco\nSal e pimenta",
-                "instructions": "Misture todos os ingredientes na coqueteleira com gelo.\nAgite suavemente.\nSirva em um copo highball com gelo.\nDecore com aipo e limão.",
-                "glass": "Copo highball",
-                "garnish": "Aipo e limão",
-                "flavor": "Picante e salgado",
-                "appearance": "Vermelho opaco",
-                "ml": 185
-            },
-            {
-                "name": "Caipirinha",
-                "ingredients": "60ml de cachaça\n1 limão cortado\n2 colheres de açúcar",
-                "instructions": "Macere o limão com o açúcar no copo.\nAdicione gelo picado.\nComplete com cachaça.\nMexa suavemente.",
-                "glass": "Copo old-fashioned",
-                "garnish": "Fatia de limão",
-                "flavor": "Doce e cítrico",
-                "appearance": "Translúcido com limão",
-                "ml": 120
-            },
-            {
-                "name": "Mai Tai",
-                "ingredients": "45ml de rum escuro\n15ml de rum branco\n15ml de Cointreau\n15ml de xarope de orgeat\n25ml de suco de limão",
-                "instructions": "Agite todos os ingredientes com gelo.\nSirva em um copo old-fashioned com gelo.\nDecore com folha de hortelã e fatia de abacaxi.",
-                "glass": "Copo old-fashioned",
-                "garnish": "Hortelã e abacaxi",
-                "flavor": "Tropical e complexo",
-                "appearance": "Âmbar dourado",
-                "ml": 115
-            },
-            {
-                "name": "French 75",
-                "ingredients": "30ml de gin\n15ml de suco de limão\n7ml de xarope simples\n60ml de champanhe",
-                "instructions": "Agite gin, suco de limão e xarope com gelo.\nCoe em uma taça de champanhe.\nComplete com champanhe.\nDecore com casca de limão.",
-                "glass": "Taça de champanhe",
-                "garnish": "Casca de limão",
-                "flavor": "Efervescente e cítrico",
-                "appearance": "Claro com bolhas",
-                "ml": 112
-            },
-            {
-                "name": "Paloma",
-                "ingredients": "50ml de tequila\n100ml de refrigerante de toranja\n15ml de suco de limão\nSal",
-                "instructions": "Umedeça a borda do copo com limão e mergulhe em sal.\nAdicione gelo, tequila e suco de limão.\nComplete com refrigerante de toranja.\nDecore com fatia de toranja.",
-                "glass": "Copo highball",
-                "garnish": "Fatia de toranja",
-                "flavor": "Cítrico e refrescante",
-                "appearance": "Rosa pálido",
-                "ml": 165
-            },
-            {
-                "name": "Pisco Sour",
-                "ingredients": "60ml de pisco\n25ml de suco de limão\n15ml de xarope simples\n1 clara de ovo\n3 dash de bitters",
-                "instructions": "Agite todos os ingredientes sem gelo para emulsificar.\nAdicione gelo e agite novamente.\nCoe em uma taça de cocktail.\nDecore com bitters no topo.",
-                "glass": "Taça de cocktail",
-                "garnish": "Bitters",
-                "flavor": "Cremoso e cítrico",
-                "appearance": "Espumoso",
-                "ml": 100
-            },
-            {
-                "name": "Sidecar",
-                "ingredients": "50ml de conhaque\n20ml de Cointreau\n20ml de suco de limão",
-                "instructions": "Agite todos os ingredientes com gelo.\nCoe em uma taça de cocktail com açúcar na borda.\nDecore com casca de limão.",
-                "glass": "Taça de cocktail",
-                "garnish": "Casca de limão",
-                "flavor": "Doce e cítrico",
-                "appearance": "Amarelo pálido",
-                "ml": 90
-            }
-        ]
-        return drinks
-    
-    def show_drink_list(self):
-        # Limpar lista atual
-        for widget in self.drink_list_frame.winfo_children():
-            widget.destroy()
-        
-        # Adicionar botões para cada drink
-        for drink in self.drinks:
+        """Abre o catálogo e carrega apenas o índice leve (id e nome) da lista.
+        
+        Roda na thread de abertura; erros são exibidos por ``_poll_startup``.
+        """
+        return self.catalog.load()
+    
+    def show_drink_list(self, drinks=None):
+        """Exibe a lista de drinks reaproveitando o pool de botões.
+        
+        Apenas os botões que cabem na tela (mais um pequeno buffer) existem;
+        na rolagem eles são religados à fatia correspondente da lista, então o
+        custo de montagem não depende do tamanho do catálogo.
+        """
+        self.visible_drinks = self.drinks if drinks is None else drinks
+        self.list_offset = 0
+        self._ensure_list_pool()
+        self._refresh_list_rows()
+    
+    def apply_ingredient_filter(self):
+        """Filtra a lista pelos ingredientes digitados (separados por vírgula).
+        
+        "Contém" mostra os drinks que usam todos os ingredientes; "Só com
+        estes" mostra os que podem ser feitos apenas com eles.
+        """
+        self.ingredient_filter_ids = self._ingredient_filter_ids()
+        self.apply_filters()
+    
+    def _ingredient_filter_ids(self):
+        terms = [term.strip() for term in self.ingredient_entry.get().split(",") if term.strip()]
+        if not terms or self.catalog.ingredient_index is None:
+            return None  # Sem índice: reaplicado por _on_ingredients_ready
+        shelf = self.ingredient_mode.get() == "Só com estes"
+        return self.catalog.ingredient_filter(terms, shelf=shelf)
+    
+    def _schedule_search(self, event=None):
+        """Agenda a busca para depois da última tecla, sem travar a digitação"""
+        if self._search_after_id is not None:
+            self.root.after_cancel(self._search_after_id)
+        self._search_after_id = self.root.after(self.search_debounce_ms, self.apply_filters)
+    
+    def apply_facet_filter(self, value=None):
+        """Filtra a lista pelos chips de copo, sabor e volume"""
+        self.facet_filter_ids = self._facet_filter_ids()
+        self.apply_filters()
+    
+    def _facet_filter_ids(self):
+        glass = self.glass_chip.get()
+        flavor = self.flavor_chip.get()
+        return self.catalog.facet_filter(
+            glass=None if glass == self.all_glasses_label else glass,
+            flavor=None if flavor == self.all_flavors_label else flavor,
+            max_ml=self.volume_limits.get(self.volume_chip.get())
+        )
+    
+    def _refresh_facet_chips(self):
+        """Preenche os chips com os copos e sabores mais comuns do catálogo"""
+        glasses = [glass for glass, count in self.catalog.facet_index.glasses()[:self.chip_options]]
+        flavors = [flavor.capitalize()
+                   for flavor, count in self.catalog.facet_index.flavors()[:self.chip_options]]
+        for chip, everything, options in ((self.glass_chip, self.all_glasses_label, glasses),
+                                          (self.flavor_chip, self.all_flavors_label, flavors)):
+            chip.configure(values=[everything] + options, state="normal")
+            if chip.get() not in options:
+                chip.set(everything)
+        self.volume_chip.configure(state="normal")
+    
+    def _filter_ids(self):
+        """Interseção dos filtros de ingredientes e dos chips (None quando nenhum está ativo)"""
+        active = [ids for ids in (self.ingredient_filter_ids, self.facet_filter_ids) if ids is not None]
+        if not active:
+            return None
+        return set.intersection(*active) if len(active) > 1 else active[0]
+    
+    def apply_filters(self):
+        """Combina busca por nome, filtro de ingredientes e chips e religa a lista"""
+        self._search_after_id = None
+        self.show_drink_list(self.catalog.filter_drinks(self.search_entry.get(),
+                                                        self._filter_ids()))
+    
+    def start_catalog_api(self):
+        """Liga a API do catálogo; as requisições são atendidas fora do loop do Tk"""
+        from catalog_server import CatalogServer
+        try:
+            self.catalog_server = CatalogServer(self.catalog, self.api_port).start()
+        except OSError as e:
+            messagebox.showerror("API", f"Erro ao iniciar a API do catálogo:\n{e}")
+            return
+        print(f"API do catálogo na porta {self.catalog_server.port}")
+    
+    def _apply_catalog_reloads(self):
+        """Aplica as diferenças preparadas pelo observador do catálogo.
+        
+        A lista mantém a posição de rolagem e só os botões cujo nome mudou
+        são reconfigurados; os detalhes abertos só são redesenhados se o
+        drink exibido tiver sido alterado ou removido.
+        """
+        try:
+            while True:
+                try:
+                    diff = self.catalog_reloads.get_nowait()
+                except queue.Empty:
+                    break
+                self._apply_catalog_reload(diff)
+        except Exception as e:
+            # O catálogo pode ter ficado pela metade: é relido inteiro em segundo plano
+            print(f"Erro ao aplicar recarga do catálogo: {e}")
+            self._reload_catalog()
+        finally:
+            self.root.after(self.catalog_poll_ms, self._apply_catalog_reloads)
+    
+    def _apply_catalog_reload(self, diff):
+        added, removed, changed = self.catalog.apply_reload(diff)
+        self.consumption_engine = None  # Remontada no próximo fechamento
+        if diff:
+            print(f"Catálogo atualizado: {len(added)} novos, {len(removed)} removidos, "
+                  f"{len(changed)} alterados")
+        
+        self._refresh_filtered_list()
+        
+        if self._current_drink_id in removed:
+            self._clear_drink_details()
+        elif self._current_drink_id in changed:
+            self.show_drink_details(self.catalog.drink_by_id[self._current_drink_id])
+        elif self._current_drink_id is not None:
+            self._show_similar(self._current_drink_id)  # Vizinhos podem ter mudado
+        elif self._reopen_after_reload is not None:
+            drink = self.catalog.find(self._reopen_after_reload)
+            self._reopen_after_reload = None
+            if drink is not None:
+                self.show_drink_details(drink)
+            else:
+                self._clear_drink_details()
+        self._build_catalog_indexes()
+    
+    def _reload_catalog(self):
+        """Relê o catálogo inteiro em segundo plano e troca pelo atual"""
+        self.run_in_background(self._load_catalog_copy, self._adopt_catalog, error_title="Catálogo")
+    
+    def _load_catalog_copy(self):
+        """Carrega o catálogo de novo, já com os índices dos filtros (roda fora do loop do Tk)"""
+        catalog = DrinkCatalog(self.catalog.path)
+        catalog.load()
+        catalog.ingredient_index = catalog.build_ingredient_index()
+        catalog.facet_index = catalog.build_facet_index()
+        return catalog
+    
+    def _refresh_filtered_list(self):
+        """Refaz os filtros ativos sobre o catálogo alterado, mantendo a rolagem da lista"""
+        if self.ingredient_filter_ids is not None:
+            self.ingredient_filter_ids = self._ingredient_filter_ids()
+        if self.catalog.facet_index is not None:
+            self._refresh_facet_chips()
+            self.facet_filter_ids = self._facet_filter_ids()
+        filtered = self.catalog.filter_drinks(self.search_entry.get(), self._filter_ids())
+        self.visible_drinks = self.drinks if filtered is None else filtered
+        self.list_offset = min(self.list_offset,
+                               max(0, len(self.visible_drinks) - self._list_page_size()))
+        self._refresh_list_rows()
+    
+    def import_recipes(self):
+        """Importa receitas de um CSV ou JSONL para o catálogo, com barra de progresso.
+        
+        Leitura, validação e gravação rodam numa thread, que também carrega o
+        catálogo atualizado e os índices dos filtros; no loop do Tk só as
+        referências são trocadas. O observador do arquivo fica pausado
+        enquanto isso, para não reler o que a importação está gravando.
+        """
+        path = filedialog.askopenfilename(
+            title="Receitas para importar",
+            filetypes=[("CSV ou JSONL", "*.csv *.jsonl *.ndjson"), ("Todos os arquivos", "*.*")]
+        )
+        if not path:
+            return
+        existing_names = set(self.catalog.drink_by_name)
+        
+        def work():
+            from importer import import_catalog
+            report = import_catalog(path, self.catalog.path, existing_names,
+                                    progress=self.import_progress.put)
+            if not report.imported:
+                return report, None
+            self.import_progress.put(None)  # Gravação concluída: carregando o catálogo
+            return report, self._load_catalog_copy()
+        
+        def finish(error=None):
+            self._importing = False
+            self.import_progress_bar.pack_forget()
+            self.import_button.configure(state="normal", text="📥 Importar receitas")
+            if self.catalog_watcher is not None:
+                # Sucesso: o catálogo já foi trocado. Erro: o que chegou a ser gravado vem pela recarga
+                self.catalog_watcher.resume(resync=error is None)
+        
+        def done(result):
+            report, catalog = result
+            if catalog is not None:
+                self._adopt_catalog(catalog)
+            finish()
+            self.show_report_window(f"Importação - {os.path.basename(path)}", report.as_text())
+        
+        if self.catalog_watcher is not None:
+            self.catalog_watcher.pause()
+        self._take_import_progress()  # Sobras da importação anterior
+        self.import_button.configure(state="disabled", text="Importando... 0%")
+        self.import_progress_bar.set(0)
+        self.import_progress_bar.pack(fill="x", pady=(5, 0))
+        self._importing = True
+        self.root.after(self.import_poll_ms, self._poll_import_progress)
+        self.run_in_background(work, done, error_title="Importação", on_error=finish)
+    
+    def _take_import_progress(self):
+        """Tudo o que a thread de importação informou desde a última leitura"""
+        updates = []
+        while True:
+            try:
+                updates.append(self.import_progress.get_nowait())
+            except queue.Empty:
+                return updates
+    
+    def _poll_import_progress(self):
+        """Mostra o último progresso informado pela thread de importação"""
+        if not self._importing:
+            return
+        updates = self._take_import_progress()
+        if updates:
+            fraction = updates[-1]
+            if fraction is None:
+                self.import_progress_bar.set(1)
+                self.import_button.configure(text="Atualizando lista...")
+            else:
+                self.import_progress_bar.set(fraction)
+                self.import_button.configure(text=f"Importando... {fraction:.0%}")
+        self.root.after(self.import_poll_ms, self._poll_import_progress)
+    
+    def _adopt_catalog(self, catalog):
+        """Troca o catálogo pelo carregado em segundo plano, mantendo filtros e detalhes"""
+        current = self.catalog.drink_by_id.get(self._current_drink_id)
+        while True:  # Recargas preparadas antes da importação já estão no catálogo novo
+            try:
+                self.catalog_reloads.get_nowait().store.close()
+            except queue.Empty:
+                break
+        self.catalog.adopt(catalog)
+        self.consumption_engine = None
+        self._refresh_filtered_list()
+        
+        drink = self.catalog.find(current["name"]) if current is not None else None
+        if drink is not None:
+            self.show_drink_details(drink)
+        elif current is not None:
+            self._clear_drink_details()
+        self._build_catalog_indexes()
+    
+    def start_order_queue(self):
+        """Liga o recebimento de pedidos e o painel da fila"""
+        try:
+            self.order_listener = OrderListener(self.order_inbox, port=self.order_port,
+                                                spool_dir=self.order_spool).start()
+        except OSError as e:
+            messagebox.showerror("Pedidos", f"Erro ao iniciar recebimento de pedidos:\n{e}")
+            return
+        
+        self.orders_button = ctk.CTkButton(
+            self.actions_frame,
+            text="🧾 Pedidos (0)",
+            command=self.show_order_panel,
+            fg_color="#333333",
+            hover_color="#444444",
+            corner_radius=10,
+            font=self.normal_font,
+            height=32
+        )
+        self.orders_button.pack(fill="x", pady=(5, 0))
+        self.show_order_panel()
+        self.root.after(self.order_poll_ms, self._drain_orders)
+    
+    def _drain_orders(self):
+        """Esvazia a fila de pedidos em lotes; o painel é atualizado uma vez por lote"""
+        batch = drain(self.order_inbox, self.order_batch_limit)
+        for order in batch:
+            self.pending_orders[order.order_id] = order
+        if batch:
+            self._refresh_order_panel()
+        self.root.after(self.order_poll_ms, self._drain_orders)
+    
+    def show_order_panel(self):
+        if self.order_panel is not None:
+            self.order_panel.deiconify()
+            self.order_panel.lift()
+            return
+        
+        self.order_panel = ctk.CTkToplevel(self.root)
+        self.order_panel.title("Pedidos pendentes")
+        self.order_panel.geometry("380x700")
+        self.order_panel.configure(fg_color=self.bg_color)
+        self.order_panel.protocol("WM_DELETE_WINDOW", self.order_panel.withdraw)
+        
+        self.order_title = ctk.CTkLabel(self.order_panel, text="", font=self.subtitle_font,
+                                        text_color=self.accent_color)
+        self.order_title.pack(pady=(15, 10))
+        
+        # Pool fixo de linhas: só os pedidos mais antigos ficam visíveis
+        for slot in range(self.order_panel_rows):
+            row = ctk.CTkFrame(self.order_panel, fg_color=self.frame_color, corner_radius=10)
+            open_button = ctk.CTkButton(
+                row, text="", anchor="w",
+                command=lambda s=slot: self._open_order(s),
+                fg_color=self.accent_color, hover_color="#64DD17",
+                text_color=self.drink_name_color, font=self.normal_font, height=36
+            )
+            open_button.pack(side="left", fill="x", expand=True, padx=(5, 0), pady=5)
+            done_button = ctk.CTkButton(
+                row, text="✓", width=36, height=36,
+                command=lambda s=slot: self._finish_order(s),
+                fg_color="#333333", hover_color="#444444", font=self.normal_font
+            )
+            done_button.pack(side="right", padx=5, pady=5)
+            row.open_button = open_button
+            row.order_id = None
+            row.packed = False
+            self.order_rows.append(row)
+        
+        self.order_overflow = ctk.CTkLabel(self.order_panel, text="", font=self.normal_font,
+                                           text_color="#AAAAAA")
+        self.order_overflow.pack(side="bottom", pady=10)
+        self._refresh_order_panel()
+    
+    def _refresh_order_panel(self):
+        count = len(self.pending_orders)
+        self.orders_button.configure(text=f"🧾 Pedidos ({count})")
+        if self.order_panel is None:
+            return
+        
+        self.order_title.configure(text=f"Pedidos pendentes: {count}")
+        oldest = iter(self.pending_orders.values())
+        for row in self.order_rows:
+            order = next(oldest, None)
+            if order is None:
+                if row.packed:
+                    row.pack_forget()
+                    row.packed = False
+                row.order_id = None
+                continue
+            if row.order_id != order.order_id:
+                table = f"Mesa {order.table} · " if order.table else ""
+                quantity = f"{order.quantity}× " if order.quantity > 1 else ""
+                row.open_button.configure(text=f"#{order.order_id}  {table}{quantity}{order.name}")
+                row.order_id = order.order_id
+            if not row.packed:
+                row.pack(fill="x", padx=10, pady=3)
+                row.packed = True
+        
+        hidden = count - len(self.order_rows)
+        self.order_overflow.configure(text=f"+ {hidden} pedidos na fila" if hidden > 0 else "")
+    
+    def _open_order(self, slot):
+        order = self.pending_orders.get(self.order_rows[slot].order_id)
+        if order is None:
+            return
+        drink = self.catalog.find(order.name)
+        if drink is None:
+            messagebox.showwarning("Pedidos", f"Drink não encontrado no catálogo: {order.name}")
+            return
+        self.show_drink_details(drink)
+    
+    def _finish_order(self, slot):
+        if self.pending_orders.pop(self.order_rows[slot].order_id, None) is not None:
+            self._refresh_order_panel()
+    
+    def run_in_background(self, work, on_done, error_title="Erro", on_error=None):
+        """Executa ``work`` numa thread e entrega o resultado a ``on_done`` no loop do Tk.
+        
+        Em caso de exceção, mostra uma mensagem de erro e chama ``on_error``.
+        """
+        results = queue.Queue(maxsize=1)
+        
+        def target():
+            try:
+                results.put((True, work()))
+            except Exception as e:
+                results.put((False, e))
+        
+        def poll():
+            try:
+                ok, value = results.get_nowait()
+            except queue.Empty:
+                self.root.after(50, poll)
+                return
+            if ok:
+                on_done(value)
+            else:
+                messagebox.showerror(error_title, str(value))
+                if on_error is not None:
+                    on_error(value)
+        
+        threading.Thread(target=target, daemon=True).start()
+        self.root.after(50, poll)
+    
+    def open_consumption_report(self):
+        """Calcula o consumo de ingredientes de um log de pedidos e mostra o relatório"""
+        path = filedialog.askopenfilename(
+            title="Log de pedidos",
+            filetypes=[("CSV ou texto", "*.csv *.txt"), ("Todos os arquivos", "*.*")]
+        )
+        if not path:
+            return
+        
+        def work():
+            from consumption import ConsumptionEngine, read_order_log  # Import adiado: usa NumPy
+            if self.consumption_engine is None:
+                self.consumption_engine = ConsumptionEngine(self.catalog.iter_records())
+            names, quantities = read_order_log(path)
+            return self.consumption_engine.compute(names, quantities)
+        
+        def restore_button(error=None):
+            self.report_button.configure(state="normal", text="📊 Fechamento do dia")
+        
+        def done(report):
+            restore_button()
+            self.show_report_window(f"Fechamento - {os.path.basename(path)}", report.as_text())
+        
+        self.report_button.configure(state="disabled", text="Calculando...")
+        self.run_in_background(work, done, error_title="Fechamento", on_error=restore_button)
+    
+    def export_recipe_cards(self):
+        """Exporta os cartões de todas as receitas (HTML e PDF) para uma pasta"""
+        directory = filedialog.askdirectory(title="Pasta dos cartões de receita")
+        if not directory:
+            return
+        
+        def work():
+            from recipe_cards import export_cards  # Import adiado: usa o Pillow e processos
+            return export_cards(self.catalog.path, directory)
+        
+        def restore_button(error=None):
+            self.cards_button.configure(state="normal", text="🖨️ Cartões de receita")
+        
+        def done(result):
+            restore_button()
+            messagebox.showinfo("Cartões de receita", f"{result.as_text()}\n\n{directory}")
+        
+        self.cards_button.configure(state="disabled", text="Exportando...")
+        self.run_in_background(work, done, error_title="Cartões de receita", on_error=restore_button)
+    
+    def show_report_window(self, title, text):
+        window = ctk.CTkToplevel(self.root)
+        window.title(title)
+        window.geometry("620x520")
+        textbox = ctk.CTkTextbox(window, font=("Courier", 12), fg_color=self.frame_color,
+                                 text_color=self.text_color)
+        textbox.pack(fill="both", expand=True, padx=10, pady=10)
+        textbox.insert("1.0", text)
+        textbox.configure(state="disabled")
+        window.lift()
+    
+    def _list_page_size(self):
+        """Quantidade de linhas inteiras que cabem na área da lista"""
+        height = self.drink_list_rows.winfo_height()
+        if height <= 1:  # Ainda não mapeado: usa a altura da janela como estimativa
+            height = self.root.winfo_height()
+        return max(1, height // self.list_row_height)
+    
+    def _ensure_list_pool(self):
+        """Cria botões até o tamanho do pool; nunca destrói os existentes"""
+        pool_size = self._list_page_size() + self.list_buffer_rows
+        while len(self.list_buttons) < pool_size:
+            slot = len(self.list_buttons)
             btn = ctk.CTkButton(
-                self.drink_list_frame,
-                text=drink["name"],
-                command=lambda d=drink: self.show_drink_details(d),
+                self.drink_list_rows,
+                text="",
+                command=lambda s=slot: self._on_list_button(s),
                 fg_color=self.accent_color,
                 hover_color="#64DD17",
                 corner_radius=10,
@@ -384,57 +999,241 @@ class DrinkApp:
                 height=40,
                 text_color=self.drink_name_color
             )
-            btn.pack(fill="x", pady=5, padx=5)
+            btn.packed = False
+            btn.bound_text = None
+            self._bind_list_mousewheel(btn)
+            self.list_buttons.append(btn)
+    
+    def _refresh_list_rows(self):
+        """Religa cada botão do pool ao drink da posição atual de rolagem"""
+        total = len(self.visible_drinks)
+        for slot, btn in enumerate(self.list_buttons):
+            index = self.list_offset + slot
+            if index < total:
+                name = self.visible_drinks[index]["name"]
+                if btn.bound_text != name:
+                    btn.configure(text=name)
+                    btn.bound_text = name
+                if not btn.packed:
+                    btn.pack(fill="x", pady=5, padx=5)
+                    btn.packed = True
+            elif btn.packed:
+                btn.pack_forget()
+                btn.packed = False
+        
+        # Atualizar barra de rolagem com a fração visível
+        if total:
+            page = self._list_page_size()
+            self.drink_list_scrollbar.set(self.list_offset / total,
+                                          min(1.0, (self.list_offset + page) / total))
+        else:
+            self.drink_list_scrollbar.set(0.0, 1.0)
+    
+    def _scroll_list_to(self, offset):
+        max_offset = max(0, len(self.visible_drinks) - self._list_page_size())
+        offset = min(max(0, int(offset)), max_offset)
+        if offset != self.list_offset:
+            self.list_offset = offset
+            self._refresh_list_rows()
+    
+    def _on_list_button(self, slot):
+        index = self.list_offset + slot
+        if index < len(self.visible_drinks):
+            self.show_drink_details(self.visible_drinks[index])
+    
+    def _on_list_scrollbar(self, action, value, unit=None):
+        if action == "moveto":
+            self._scroll_list_to(float(value) * len(self.visible_drinks))
+        elif action == "scroll":
+            step = self._list_page_size() if unit == "pages" else 1
+            self._scroll_list_to(self.list_offset + int(value) * step)
+    
+    def _on_list_resize(self, event):
+        # A janela cresceu: amplia o pool (só acontece até caber a tela toda)
+        count = len(self.list_buttons)
+        self._ensure_list_pool()
+        if len(self.list_buttons) != count:
+            self._refresh_list_rows()
+    
+    def _bind_list_mousewheel(self, widget):
+        widget.bind("<MouseWheel>", self._on_list_mousewheel)  # Windows / macOS
+        widget.bind("<Button-4>", lambda e: self._scroll_list_to(self.list_offset - 1))  # Linux
+        widget.bind("<Button-5>", lambda e: self._scroll_list_to(self.list_offset + 1))
+    
+    def _on_list_mousewheel(self, event):
+        if event.delta:
+            self._scroll_list_to(self.list_offset - (1 if event.delta > 0 else -1))
     
     def show_drink_details(self, drink):
-        # Limpar detalhes atuais
-        for widget in self.drink_details.winfo_children():
-            widget.destroy()
+        """Exibe os detalhes do drink reconfigurando o pool de seções.
+        
+        Frames e labels são criados uma única vez e apenas têm o texto
+        atualizado; o pool só cresce quando um drink tem mais linhas do que
+        qualquer outro já exibido.
+        """
+        # A lista guarda só o índice; o registro completo vem do catálogo
+        if "ingredients" not in drink:
+            try:
+                drink = self.catalog.get(drink["id"])
+            except CatalogError:
+                # Arquivo salvo e ainda não recarregado: o drink é aberto depois da recarga
+                self._clear_drink_details()
+                self.content_title.configure(text="Atualizando catálogo...")
+                self._reopen_after_reload = drink["name"]
+                return
+        self._reopen_after_reload = None
         
         # Atualizar título
         self.content_title.configure(text=drink["name"])
+        self._current_drink_id = drink["id"]
         
-        # Criar elementos de detalhes
-        details = [
-            ("🍹 Copo", drink["glass"]),
-            ("🧊 Volume", f"{drink['ml']}ml"),
-            ("🌿 Ingredientes", drink["ingredients"]),
-            ("👨‍🍳 Modo de Preparo", drink["instructions"]),
-            ("🍒 Guarnição", drink["garnish"]),
-            ("👅 Sabor", drink["flavor"]),
-            ("👀 Aparência", drink["appearance"])
-        ]
-        
-        for icon, text in details:
+        # Seções formatadas pela camada de dados; aqui só são desenhadas
+        details = format_drink_details(drink)
+        
+        while len(self.detail_sections) < len(details):
             frame = ctk.CTkFrame(self.drink_details, fg_color="transparent")
-            frame.pack(fill="x", pady=5)
-            
-            label = ctk.CTkLabel(
-                frame, 
-                text=icon + " " + text.split("\n")[0],
-                font=self.subtitle_font if "\n" not in text else self.normal_font,
-                text_color=self.accent_color if "\n" not in text else self.text_color,
-                anchor="w"
-            )
+            self.detail_sections.append({"frame": frame, "labels": [], "shown": 0, "packed": False})
+        
+        for index, section in enumerate(self.detail_sections):
+            if index < len(details):
+                self._bind_detail_section(section, details[index])
+                if not section["packed"]:
+                    section["frame"].pack(fill="x", pady=5)
+                    section["packed"] = True
+            elif section["packed"]:
+                section["frame"].pack_forget()
+                section["packed"] = False
+        
+        self._show_drink_photo(drink)
+        self._show_similar(drink["id"])
+    
+    def _show_similar(self, drink_id):
+        """Religa os botões de drinks parecidos (consulta à tabela pré-calculada)"""
+        similar = self.catalog.similar_drinks(drink_id, self.similar_count)
+        for button, drink in zip(self.similar_buttons, similar):
+            button.drink_id = drink["id"]
+            if button.bound_text != drink["name"]:
+                button.configure(text=drink["name"])
+                button.bound_text = drink["name"]
+            if not button.packed:
+                button.pack(side="left", padx=3)
+                button.packed = True
+        for button in self.similar_buttons[len(similar):]:
+            button.drink_id = None
+            if button.packed:
+                button.pack_forget()
+                button.packed = False
+        if similar and not self.similar_frame.packed:
+            self.similar_frame.pack(fill="x", padx=20, before=self.footer)
+            self.similar_frame.packed = True
+        elif not similar and self.similar_frame.packed:
+            self.similar_frame.pack_forget()
+            self.similar_frame.packed = False
+    
+    def _on_similar_button(self, slot):
+        drink = self.catalog.drink_by_id.get(self.similar_buttons[slot].drink_id)
+        if drink is not None:
+            self.show_drink_details(drink)
+    
+    def _clear_drink_details(self):
+        """Volta o painel ao estado inicial (o drink exibido saiu do catálogo)"""
+        self.content_title.configure(text="Selecione um drink")
+        self._current_drink_id = None
+        for section in self.detail_sections:
+            if section["packed"]:
+                section["frame"].pack_forget()
+                section["packed"] = False
+        if self.detail_photo.packed:
+            self.detail_photo.pack_forget()
+            self.detail_photo.packed = False
+        self._show_similar(None)
+    
+    def _drink_photo_path(self, drink):
+        """Caminho da foto do drink: campo ``image`` do registro ou images/<nome>.png|.jpg"""
+        if drink.get("image"):
+            return os.path.join(BASE_DIR, drink["image"])
+        slug = normalize(drink["name"]).replace(" ", "-")
+        for extension in (".png", ".jpg", ".jpeg"):
+            path = os.path.join(IMAGES_DIR, slug + extension)
+            if os.path.exists(path):
+                return path
+        return None
+    
+    def _show_drink_photo(self, drink):
+        """Mostra um marcador e pede a foto ao carregador, sem bloquear o clique"""
+        path = self._drink_photo_path(drink)
+        if path is None or not os.path.exists(path):
+            if self.detail_photo.packed:
+                self.detail_photo.pack_forget()
+                self.detail_photo.packed = False
+            return
+        
+        if self._photo_placeholder is None:
+            self._photo_placeholder = ImageTk.PhotoImage(
+                Image.new("RGB", self.drink_photo_size, "#2A2A2A"))
+        self.detail_photo.configure(image=self._photo_placeholder)
+        if not self.detail_photo.packed:
+            self.detail_photo.pack(pady=(0, 10), before=self.detail_sections[0]["frame"])
+            self.detail_photo.packed = True
+        
+        drink_id = drink["id"]
+        def on_loaded(photo):
+            # Ignora fotos que chegam depois de outro drink ter sido aberto
+            if photo is not None and self._current_drink_id == drink_id:
+                self.detail_photo.configure(image=photo)
+        self.image_loader.request(path, self.drink_photo_size, on_loaded)
+    
+    def _bind_detail_section(self, section, lines):
+        """Atualiza os labels de uma seção, mostrando ou escondendo as linhas extras"""
+        multiline = len(lines) > 1
+        
+        configs = [(lines[0],
+                    self.normal_font if multiline else self.subtitle_font,
+                    self.text_color if multiline else self.accent_color)]
+        configs += [(line, self.normal_font, self.text_color) for line in lines[1:]]
+        
+        labels = section["labels"]
+        while len(labels) < len(configs):
+            label = ctk.CTkLabel(section["frame"], text="", anchor="w")
+            label.bound = None
+            labels.append(label)
+        
+        for label, config in zip(labels, configs):
+            if label.bound != config:
+                text, font, color = config
+                label.configure(text=text, font=font, text_color=color)
+                label.bound = config
+        
+        # As linhas visíveis são sempre um prefixo do pool, então reempacotar
+        # em ordem preserva a sequência original
+        for label in labels[section["shown"]:len(configs)]:
             label.pack(fill="x")
-            
-            if "\n" in text:
-                for line in text.split("\n")[1:]:
-                    line_label = ctk.CTkLabel(
-                        frame,
-                        text=line,
-                        font=self.normal_font,
-                        text_color=self.text_color,
-                        anchor="w"
-                    )
-                    line_label.pack(fill="x")
-
-  
-        return drinks
+        for label in labels[len(configs):section["shown"]]:
+            label.pack_forget()
+        section["shown"] = len(configs)
     
-  
 
 if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Oguru Sushi & Bar - Drinks Clássicos")
+    parser.add_argument("catalog", nargs="?", default=DEFAULT_CATALOG,
+                        help="catálogo de receitas (.jsonl, .json ou SQLite)")
+    parser.add_argument("--splash-ms", type=int, default=DEFAULT_MIN_SPLASH_MS,
+                        help="tempo mínimo da tela de abertura em ms (0 desativa)")
+    parser.add_argument("--orders-port", type=int,
+                        help="recebe pedidos do PDV nesta porta TCP local (ex.: 5055)")
+    parser.add_argument("--orders-spool",
+                        help="recebe pedidos dos arquivos .orders gravados nesta pasta")
+    parser.add_argument("--instrument", nargs="?", const="oguru-metrics.jsonl", metavar="LOG",
+                        help="registra métricas de desempenho em LOG (JSONL); F12 mostra o resumo")
+    parser.add_argument("--api-port", type=int,
+                        help="serve o catálogo em JSON para os tablets nesta porta (ex.: 8080)")
+    parser.add_argument("--no-watch", action="store_true",
+                        help="não recarrega o catálogo quando o arquivo for alterado")
+    args = parser.parse_args()
+    
     root = ctk.CTk()
-    app = DrinkApp(root)
+    app = DrinkApp(root, args.catalog, min_splash_ms=args.splash_ms,
+                   order_port=args.orders_port, order_spool=args.orders_spool,
+                   instrument_log=args.instrument, watch_catalog=not args.no_watch,
+                   api_port=args.api_port)
     root.mainloop()
\ No newline at end of file
@@ -0,0 +1,129 @@
+"""Recebimento de pedidos do PDV (ou de um simulador) em segundo plano.
+
+Os pedidos chegam por um socket TCP local, uma linha por pedido, ou por
+arquivos deixados numa pasta de spool. Cada linha pode ser só o nome do
+drink ou um JSON ``{"name": ..., "table": ..., "quantity": ...}``.
+
+As threads de recebimento apenas colocam ``Order`` numa ``queue.Queue``; a
+interface esvazia a fila em lotes a partir do loop do Tk.
+"""
+import itertools
+import json
+import os
+import queue
+import socketserver
+import threading
+import time
+from collections import namedtuple
+
+DEFAULT_PORT = 5055
+
+Order = namedtuple("Order", "order_id name table quantity received_at")
+
+_order_ids = itertools.count(1)
+
+
+def parse_order(line):
+    """Converte uma linha recebida em ``Order`` (None para linhas vazias ou inválidas)"""
+    line = line.strip()
+    if not line:
+        return None
+    if line.startswith("{"):
+        try:
+            data = json.loads(line)
+            name = str(data["name"]).strip()
+            quantity = int(data.get("quantity") or 1)
+        except (ValueError, KeyError, TypeError):
+            return None
+        table = data.get("table")
+    else:
+        name, table, quantity = line, None, 1
+    if not name:
+        return None
+    return Order(next(_order_ids), name, table, max(1, quantity), time.time())
+
+
+class _OrderHandler(socketserver.StreamRequestHandler):
+    def handle(self):
+        for raw in self.rfile:
+            order = parse_order(raw.decode("utf-8", errors="replace"))
+            if order is not None:
+                self.server.orders.put(order)
+
+
+class _OrderServer(socketserver.ThreadingTCPServer):
+    daemon_threads = True
+    allow_reuse_address = True
+
+
+class OrderListener:
+    """Escuta pedidos no socket e/ou na pasta de spool e os coloca em ``orders``"""
+
+    def __init__(self, orders, port=DEFAULT_PORT, spool_dir=None, host="127.0.0.1",
+                 spool_interval=0.5):
+        self.orders = orders
+        self.host = host
+        self.port = port
+        self.spool_dir = spool_dir
+        self.spool_interval = spool_interval
+        self._server = None
+        self._stop = threading.Event()
+        self._threads = []
+
+    def start(self):
+        if self.port is not None:
+            self._server = _OrderServer((self.host, self.port), _OrderHandler)
+            self._server.orders = self.orders
+            self.port = self._server.server_address[1]  # Porta real quando 0 foi pedido
+            self._spawn(self._server.serve_forever)
+        if self.spool_dir is not None:
+            os.makedirs(self.spool_dir, exist_ok=True)
+            self._spawn(self._watch_spool)
+        return self
+
+    def _spawn(self, target):
+        thread = threading.Thread(target=target, daemon=True)
+        thread.start()
+        self._threads.append(thread)
+
+    def _watch_spool(self):
+        """Lê os arquivos da pasta em ordem de nome e os apaga depois de processados.
+
+        O PDV deve gravar com outra extensão e renomear para ``.orders`` ao
+        terminar, para que arquivos pela metade nunca sejam lidos.
+        """
+        while not self._stop.is_set():
+            try:
+                names = sorted(n for n in os.listdir(self.spool_dir) if n.endswith(".orders"))
+            except OSError as e:
+                print(f"Erro ao ler spool de pedidos: {e}")
+                names = []
+            for name in names:
+                path = os.path.join(self.spool_dir, name)
+                try:
+                    with open(path, encoding="utf-8") as f:
+                        for line in f:
+                            order = parse_order(line)
+                            if order is not None:
+                                self.orders.put(order)
+                    os.remove(path)
+                except OSError as e:
+                    print(f"Erro ao ler pedidos de {name}: {e}")
+            self._stop.wait(self.spool_interval)
+
+    def stop(self):
+        self._stop.set()
+        if self._server is not None:
+            self._server.shutdown()
+            self._server.server_close()
+
+
+def drain(orders, limit):
+    """Retira até ``limit`` pedidos da fila sem bloquear"""
+    batch = []
+    try:
+        while len(batch) < limit:
+            batch.append(orders.get_nowait())
+    except queue.Empty:
+        pass
+    return batch
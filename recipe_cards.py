@@ -0,0 +1,287 @@
+"""Cartões de receita para impressão (treinamento da equipe).
+
+Cada receita vira um cartão em HTML e, com o Pillow, em PNG e/ou PDF, com as
+mesmas seções do painel de detalhes. A exportação percorre o catálogo em
+fluxo e distribui os cartões entre processos; os arquivos são gravados pelos
+próprios processos. Um manifesto na pasta de saída guarda o hash do conteúdo
+de cada receita, e cartões cuja receita não mudou desde a última exportação
+são pulados.
+
+    python recipe_cards.py drinks.jsonl cartoes/ --formats html,pdf
+"""
+import argparse
+import hashlib
+import html
+import json
+import multiprocessing
+import os
+import re
+import time
+from concurrent.futures import ALL_COMPLETED, FIRST_COMPLETED, ProcessPoolExecutor, wait
+
+from catalog_store import FIELDS, open_catalog
+from drink_model import format_drink_details
+from ingredients import normalize
+
+FORMATS = ("html", "png", "pdf")
+MANIFEST_NAME = ".cards-manifest.json"
+
+# Muda quando o layout dos cartões muda, para que todos sejam refeitos
+CARD_VERSION = 1
+
+CARD_WIDTH = 1240           # px; 150 dpi, largura de um A5
+CARD_MARGIN = 80
+CARD_DPI = 150
+CHUNK_SIZE = 32             # receitas por tarefa enviada aos processos
+
+_EMOJI = re.compile("[\U00010000-\U0010FFFF\u200d\ufe0f]")
+
+CARD_CSS = """
+body { font-family: Helvetica, Arial, sans-serif; max-width: 17cm; margin: 1.5cm auto; color: #121212; }
+h1 { border-bottom: 3px solid #76FF03; padding-bottom: .2em; }
+h2 { font-size: 1.1em; margin: 1em 0 .3em; }
+section { margin-top: 1em; }
+p { margin: .2em 0; }
+@media print { body { margin: 0 auto; } }
+"""
+
+
+class ExportResult:
+    """Resumo de ``export_cards``"""
+
+    def __init__(self, written, skipped, removed, seconds):
+        self.written = written    # cartões gerados nesta exportação
+        self.skipped = skipped    # receitas sem alteração desde a última
+        self.removed = removed    # cartões de receitas que saíram do catálogo
+        self.seconds = seconds
+
+    def as_text(self):
+        return (f"{self.written} cartões gerados, {self.skipped} sem alteração, "
+                f"{self.removed} removidos em {self.seconds:.1f} s")
+
+
+def card_slug(name):
+    """Nome de arquivo do cartão: nome do drink sem acentos, com hífens"""
+    return re.sub(r"[^a-z0-9]+", "-", normalize(name)).strip("-") or "drink"
+
+
+def content_hash(record):
+    """Hash do conteúdo que aparece no cartão (e da versão do layout)"""
+    content = json.dumps([CARD_VERSION] + [record.get(field) for field in FIELDS],
+                         ensure_ascii=False)
+    return hashlib.sha1(content.encode("utf-8")).hexdigest()
+
+
+def render_card_html(record):
+    """Cartão em HTML: título com o nome e uma seção por campo dos detalhes.
+
+    Como no painel, seções de uma linha ficam em destaque e as demais
+    (ingredientes, preparo) em texto normal.
+    """
+    parts = ["<!DOCTYPE html>", '<html lang="pt-BR"><head><meta charset="utf-8">',
+             f"<title>{html.escape(record['name'])}</title><style>{CARD_CSS}</style></head><body>",
+             f"<h1>{html.escape(record['name'])}</h1>"]
+    for lines in format_drink_details(record):
+        if len(lines) == 1:
+            parts.append(f"<h2>{html.escape(lines[0])}</h2>")
+        else:
+            parts.append("<section>")
+            parts.extend(f"<p>{html.escape(line)}</p>" for line in lines if line.strip())
+            parts.append("</section>")
+    parts.append("</body></html>")
+    return "\n".join(parts)
+
+
+def _load_font(size, bold=False):
+    from PIL import ImageFont
+    try:
+        return ImageFont.truetype("DejaVuSans-Bold.ttf" if bold else "DejaVuSans.ttf", size)
+    except OSError:
+        try:
+            return ImageFont.load_default(size)
+        except TypeError:  # Pillow < 10.1: fonte padrão de tamanho fixo
+            return ImageFont.load_default()
+
+
+def _wrap(text, font, width):
+    """Quebra ``text`` em linhas que cabem em ``width`` pixels"""
+    lines = []
+    current = ""
+    for word in text.split():
+        candidate = f"{current} {word}" if current else word
+        if current and font.getlength(candidate) > width:
+            lines.append(current)
+            current = word
+        else:
+            current = candidate
+    lines.append(current)
+    return lines
+
+
+def render_card_image(record, fonts):
+    """Cartão como imagem do Pillow (os ícones das seções ficam de fora)"""
+    from PIL import Image, ImageDraw
+    title_font, heading_font, text_font = fonts
+    width = CARD_WIDTH - 2 * CARD_MARGIN
+
+    # (texto, fonte, espaço antes) de cada linha, já quebradas na largura do cartão
+    rows = [(line, title_font, 0) for line in _wrap(record["name"], title_font, width)]
+    for lines in format_drink_details(record):
+        lines = [_EMOJI.sub("", lines[0]).strip()] + [line for line in lines[1:] if line.strip()]
+        font = heading_font if len(lines) == 1 else text_font
+        parts = [part for line in lines for part in _wrap(line, font, width)]
+        rows += [(part, font, 30 if i == 0 else 0) for i, part in enumerate(parts)]
+
+    def line_height(font):
+        return font.size * 1.35 if hasattr(font, "size") else 14
+
+    height = int(2 * CARD_MARGIN + 20 + sum(line_height(font) + space for _, font, space in rows))
+    image = Image.new("RGB", (CARD_WIDTH, height), "#FFFFFF")
+    draw = ImageDraw.Draw(image)
+    y = CARD_MARGIN
+    for index, (text, font, space) in enumerate(rows):
+        y += space
+        draw.text((CARD_MARGIN, y), text, font=font, fill="#121212")
+        y += line_height(font)
+        if font is title_font and (index + 1 == len(rows) or rows[index + 1][1] is not title_font):
+            draw.line((CARD_MARGIN, y + 5, CARD_WIDTH - CARD_MARGIN, y + 5), fill="#76FF03", width=6)
+            y += 20
+    return image
+
+
+def _write_cards(jobs, output_dir, formats):
+    """Tarefa de um processo: grava os cartões de um lote de receitas"""
+    fonts = None
+    if "png" in formats or "pdf" in formats:
+        fonts = (_load_font(48, bold=True), _load_font(30, bold=True), _load_font(26))
+    done = []
+    for slug, digest, record in jobs:
+        base = os.path.join(output_dir, slug)
+        if "html" in formats:
+            with open(base + ".html", "w", encoding="utf-8") as f:
+                f.write(render_card_html(record))
+        if fonts is not None:
+            image = render_card_image(record, fonts)
+            if "png" in formats:
+                image.save(base + ".png", optimize=True)
+            if "pdf" in formats:
+                image.save(base + ".pdf", "PDF", resolution=CARD_DPI)
+        done.append((slug, digest))
+    return done
+
+
+def _load_manifest(path):
+    try:
+        with open(path, encoding="utf-8") as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return {}
+
+
+def _save_manifest(path, manifest):
+    with open(path + ".tmp", "w", encoding="utf-8") as f:
+        json.dump(manifest, f, ensure_ascii=False, sort_keys=True)
+    os.replace(path + ".tmp", path)
+
+
+def export_cards(catalog_path, output_dir, formats=("html", "pdf"), workers=None, progress=None):
+    """Exporta os cartões de todas as receitas de ``catalog_path`` para ``output_dir``.
+
+    As receitas são lidas uma a uma e enviadas em lotes a um pool de
+    processos, com no máximo dois lotes por processo em andamento, então a
+    memória não cresce com o catálogo. ``progress(gerados, pulados)`` é
+    chamado a cada lote concluído.
+    """
+    unknown = set(formats) - set(FORMATS)
+    if unknown:
+        raise ValueError(f"Formato desconhecido: {', '.join(sorted(unknown))}")
+    start = time.perf_counter()
+    os.makedirs(output_dir, exist_ok=True)
+    manifest_path = os.path.join(output_dir, MANIFEST_NAME)
+    previous = _load_manifest(manifest_path)
+    manifest = {}
+    seen = set()
+    written = skipped = 0
+
+    def exists(slug):
+        return all(os.path.exists(os.path.join(output_dir, f"{slug}.{fmt}")) for fmt in formats)
+
+    workers = workers or os.cpu_count() or 1
+    # "spawn": os processos não herdam as threads do Tk nem o estado do app
+    context = multiprocessing.get_context("spawn")
+    store = open_catalog(catalog_path)
+    finished = False
+    try:
+        with ProcessPoolExecutor(max_workers=workers, mp_context=context) as pool:
+            running = set()
+
+            def collect(return_when):
+                nonlocal written
+                finished, pending = wait(running, return_when=return_when)
+                running.intersection_update(pending)
+                for future in finished:
+                    for slug, digest in future.result():
+                        manifest[slug] = digest
+                        written += 1
+                if finished and progress is not None:
+                    progress(written, skipped)
+
+            chunk = []
+            for record in store.iter_records():
+                slug = card_slug(record["name"])
+                if slug in seen:  # Nomes que só diferem em acentos/pontuação
+                    slug = f"{slug}-{record['id']}"
+                seen.add(slug)
+                digest = content_hash(record)
+                if previous.get(slug) == digest and exists(slug):
+                    manifest[slug] = digest
+                    skipped += 1
+                    continue
+                chunk.append((slug, digest, record))
+                if len(chunk) == CHUNK_SIZE:
+                    if len(running) >= 2 * workers:
+                        collect(FIRST_COMPLETED)
+                    running.add(pool.submit(_write_cards, chunk, output_dir, tuple(formats)))
+                    chunk = []
+            if chunk:
+                running.add(pool.submit(_write_cards, chunk, output_dir, tuple(formats)))
+            if running:
+                collect(ALL_COMPLETED)
+        finished = True
+    finally:
+        store.close()
+        if not finished:  # Interrompida: o que já foi gravado não é refeito na próxima
+            _save_manifest(manifest_path, dict(previous, **manifest))
+
+    # Cartões de receitas que saíram do catálogo
+    removed = 0
+    for slug in previous.keys() - manifest.keys():
+        for fmt in FORMATS:
+            path = os.path.join(output_dir, f"{slug}.{fmt}")
+            if os.path.exists(path):
+                os.remove(path)
+        removed += 1
+    _save_manifest(manifest_path, manifest)
+    return ExportResult(written, skipped, removed, time.perf_counter() - start)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Exporta cartões de receita para impressão")
+    parser.add_argument("catalog", help="catálogo de receitas (.jsonl, .json ou SQLite)")
+    parser.add_argument("output", help="pasta de saída")
+    parser.add_argument("--formats", default="html,pdf",
+                        help="formatos separados por vírgula: html, png, pdf (padrão: html,pdf)")
+    parser.add_argument("--workers", type=int, help="processos (padrão: um por CPU)")
+    args = parser.parse_args()
+
+    def progress(written, skipped):
+        print(f"\r{written} gerados, {skipped} sem alteração", end="", flush=True)
+
+    result = export_cards(args.catalog, args.output,
+                          [fmt.strip() for fmt in args.formats.split(",") if fmt.strip()],
+                          workers=args.workers, progress=progress)
+    print(f"\r{result.as_text()}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,129 @@
+"""Busca incremental por nome de drink.
+
+Os nomes são normalizados (minúsculas, sem acentos, ver
+``ingredients.normalize``) e quebrados em palavras. Cada palavra da consulta
+casa por prefixo, via busca binária no vocabulário ordenado; se nenhuma
+palavra tiver o prefixo, tenta as palavras a até 1-2 edições de distância,
+encontradas pelos trigramas em comum ("negorni" → "negroni").
+"""
+from bisect import bisect_left, insort
+
+from ingredients import normalize
+
+
+def _trigrams(word):
+    padded = f"  {word} "
+    return {padded[i:i + 3] for i in range(len(padded) - 2)}
+
+
+def _edit_distance(a, b, limit):
+    """Distância de edição com transposição; para de calcular acima de ``limit``"""
+    if abs(len(a) - len(b)) > limit:
+        return limit + 1
+    previous2 = None
+    previous = list(range(len(b) + 1))
+    for i in range(1, len(a) + 1):
+        current = [i] + [0] * len(b)
+        for j in range(1, len(b) + 1):
+            cost = a[i - 1] != b[j - 1]
+            current[j] = min(previous[j] + 1, current[j - 1] + 1, previous[j - 1] + cost)
+            if (previous2 is not None and i > 1 and j > 1
+                    and a[i - 1] == b[j - 2] and a[i - 2] == b[j - 1]):
+                current[j] = min(current[j], previous2[j - 2] + 1)
+        if min(current) > limit:
+            return limit + 1
+        previous2, previous = previous, current
+    return previous[-1]
+
+
+class NameSearchIndex:
+    """Índice de prefixos e trigramas sobre os nomes do catálogo"""
+
+    def __init__(self, drinks=()):
+        self._position = {}   # id → posição no catálogo (ordem dos resultados)
+        self._names = {}      # id → palavras normalizadas do nome
+        self._word_ids = {}   # palavra → ids dos drinks que a usam
+        self._vocabulary = []  # palavras ordenadas, para a busca por prefixo
+        self._trigram_words = {}
+        for drink in drinks:
+            self._add(drink["id"], drink["name"], sorted_insert=False)
+        self._vocabulary.sort()
+
+    def __len__(self):
+        return len(self._names)
+
+    def add(self, drink_id, name):
+        self._add(drink_id, name, sorted_insert=True)
+
+    def _add(self, drink_id, name, sorted_insert):
+        if drink_id in self._names:
+            self.remove(drink_id)
+        words = normalize(name).split()
+        self._names[drink_id] = words
+        self._position.setdefault(drink_id, len(self._position))
+        for word in words:
+            ids = self._word_ids.get(word)
+            if ids is None:
+                ids = self._word_ids[word] = set()
+                if sorted_insert:
+                    insort(self._vocabulary, word)
+                else:  # Montagem em lote: ordena uma vez no final
+                    self._vocabulary.append(word)
+                for trigram in _trigrams(word):
+                    self._trigram_words.setdefault(trigram, set()).add(word)
+            ids.add(drink_id)
+
+    def reorder(self, drink_ids):
+        """Passa a ordenar os resultados pela ordem de ``drink_ids`` (o catálogo recarregado)"""
+        self._position = {drink_id: position for position, drink_id in enumerate(drink_ids)}
+
+    def remove(self, drink_id):
+        self._position.pop(drink_id, None)
+        for word in self._names.pop(drink_id, ()):
+            ids = self._word_ids[word]
+            ids.discard(drink_id)
+            if not ids:
+                del self._word_ids[word]
+                del self._vocabulary[bisect_left(self._vocabulary, word)]
+                for trigram in _trigrams(word):
+                    self._trigram_words[trigram].discard(word)
+
+    def _prefix_ids(self, prefix):
+        ids = set()
+        vocabulary = self._vocabulary
+        position = bisect_left(vocabulary, prefix)
+        while position < len(vocabulary) and vocabulary[position].startswith(prefix):
+            ids |= self._word_ids[vocabulary[position]]
+            position += 1
+        return ids
+
+    def _fuzzy_ids(self, word):
+        if len(word) < 4:  # Palavras curtas demais geram ruído
+            return set()
+        limit = 1 if len(word) < 7 else 2
+        candidates = set()
+        for trigram in _trigrams(word):
+            candidates |= self._trigram_words.get(trigram, set())
+        ids = set()
+        for candidate in candidates:
+            # Compara também com o começo da palavra, para tolerar erros ao digitar
+            if (_edit_distance(word, candidate, limit) <= limit
+                    or _edit_distance(word, candidate[:len(word)], limit) <= limit):
+                ids |= self._word_ids[candidate]
+        return ids
+
+    def search(self, query):
+        """Ids cujo nome contém todas as palavras da consulta, na ordem do catálogo.
+
+        Devolve ``None`` para uma consulta vazia (sem filtro).
+        """
+        words = normalize(query).split()
+        if not words:
+            return None
+        result = None
+        for word in words:
+            ids = self._prefix_ids(word) or self._fuzzy_ids(word)
+            result = ids if result is None else result & ids
+            if not result:
+                return []
+        return sorted(result, key=self._position.__getitem__)
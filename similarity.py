@@ -0,0 +1,205 @@
+"""Drinks parecidos, pré-calculados para o painel de detalhes.
+
+Cada receita vira um vetor com o volume (ml) de cada ingrediente e as
+palavras de ``flavor``, ``glass`` e ``appearance``. Os vetores têm tamanho
+fixo (as características são espalhadas por hash), então o catálogo inteiro
+cabe numa única matriz ``float32`` e a similaridade de cosseno é um produto de
+matrizes feito em lotes. A tabela guarda os ``k`` vizinhos de cada receita;
+inclusões, alterações e remoções recalculam só a linha da receita e as das
+receitas que a tinham entre os vizinhos.
+"""
+import zlib
+
+import numpy as np
+
+from ingredients import UNIT_ML, normalize, parse_ingredients
+
+DEFAULT_DIMENSIONS = 256
+DEFAULT_NEIGHBORS = 8
+BATCH_ROWS = 256              # linhas por produto de matrizes (memória: lote × receitas)
+
+# Peso de cada grupo de características no vetor final
+INGREDIENT_WEIGHT = 0.8
+TOKEN_WEIGHT = 0.6
+
+# Volume atribuído a itens sem medida em ml (cubos, "Água com gás")
+UNMEASURED_ML = 10.0
+
+STOPWORDS = {"com", "sem", "uma", "para", "por", "mas", "muito", "pouco", "bem"}
+
+
+def recipe_features(record):
+    """Características da receita: (nome, peso) de ingredientes e de palavras"""
+    ingredients = {}
+    measured = 0.0
+    unmeasured = []
+    for item in parse_ingredients(record.get("ingredients") or ""):
+        key = "i:" + normalize(item.name)
+        if item.quantity is not None and item.unit in UNIT_ML:
+            volume = item.quantity * UNIT_ML[item.unit]
+            measured += volume
+            ingredients[key] = ingredients.get(key, 0.0) + volume
+        else:
+            unmeasured.append(key)
+    # Mesma regra do fechamento: um único item sem medida completa o volume
+    remainder = float(record.get("ml") or 0) - measured
+    for key in unmeasured:
+        volume = remainder if len(unmeasured) == 1 and remainder > 0 else UNMEASURED_ML
+        ingredients[key] = ingredients.get(key, 0.0) + volume
+
+    tokens = {}
+    if record.get("glass"):
+        tokens["g:" + normalize(record["glass"])] = 1.0
+    for field in ("flavor", "appearance"):
+        for word in normalize(record.get(field) or "").replace(",", " ").split():
+            if len(word) > 2 and word not in STOPWORDS:
+                tokens[f"{field[0]}:{word}"] = 1.0
+    return ingredients, tokens
+
+
+def _hashed(features, dimensions):
+    """Espalha as características num vetor de tamanho fixo, com sinal pelo hash"""
+    vector = np.zeros(dimensions, dtype=np.float32)
+    for name, weight in features.items():
+        digest = zlib.crc32(name.encode("utf-8"))
+        vector[digest % dimensions] += weight if digest & 0x80000000 else -weight
+    norm = np.linalg.norm(vector)
+    return vector / norm if norm else vector
+
+
+def recipe_vector(record, dimensions=DEFAULT_DIMENSIONS):
+    """Vetor unitário da receita (ingredientes e palavras com os pesos dos grupos)"""
+    ingredients, tokens = recipe_features(record)
+    vector = (INGREDIENT_WEIGHT * _hashed(ingredients, dimensions)
+              + TOKEN_WEIGHT * _hashed(tokens, dimensions))
+    norm = np.linalg.norm(vector)
+    return vector / norm if norm else vector
+
+
+class SimilarityIndex:
+    """Tabela dos ``k`` drinks mais parecidos com cada receita.
+
+    As receitas são identificadas pelo ``id`` do catálogo; internamente cada
+    uma ocupa uma linha fixa da matriz de vetores (linhas de receitas
+    removidas são reaproveitadas).
+    """
+
+    def __init__(self, records=(), k=DEFAULT_NEIGHBORS, dimensions=DEFAULT_DIMENSIONS):
+        self.k = k
+        self.dimensions = dimensions
+        self._row_of = {}                       # id → linha
+        self._free = []                         # linhas de receitas removidas
+        self._size = 0                          # linhas em uso (inclusive as livres)
+        self._ids = np.empty(0, dtype=np.int64)
+        self._vectors = np.empty((0, dimensions), dtype=np.float32)
+        self._neighbors = np.empty((0, k), dtype=np.int64)
+        self._scores = np.empty((0, k), dtype=np.float32)
+
+        for record in records:
+            self._store(record["id"], recipe_vector(record, dimensions))
+        self._recompute(np.arange(self._size))
+
+    def __len__(self):
+        return len(self._row_of)
+
+    def similar(self, drink_id, count=None):
+        """Ids dos drinks mais parecidos com ``drink_id``, do mais ao menos parecido"""
+        row = self._row_of.get(drink_id)
+        if row is None:
+            return []
+        rows = [r for r, score in zip(self._neighbors[row], self._scores[row])
+                if r >= 0 and score > 0]
+        return self._ids[rows[:count]].tolist()
+
+    def add(self, drink_id, record):
+        """Inclui ou atualiza uma receita sem recalcular a tabela inteira"""
+        row = self._row_of.get(drink_id)
+        if row is not None:
+            self._vectors[row] = recipe_vector(record, self.dimensions)
+        else:
+            row = self._store(drink_id, recipe_vector(record, self.dimensions))
+        self._refresh(row)
+
+    def remove(self, drink_id):
+        row = self._row_of.pop(drink_id, None)
+        if row is None:
+            return
+        self._ids[row] = -1
+        self._vectors[row] = 0
+        self._neighbors[row] = -1
+        self._scores[row] = -np.inf
+        self._free.append(row)
+        self._recompute(self._rows_pointing_to(row))
+
+    def _store(self, drink_id, vector):
+        if self._free:
+            row = self._free.pop()
+        else:
+            row = self._size
+            self._size += 1
+            if row == len(self._ids):
+                self._grow(max(16, 2 * len(self._ids)))
+        self._row_of[drink_id] = row
+        self._ids[row] = drink_id
+        self._vectors[row] = vector
+        return row
+
+    def _grow(self, capacity):
+        extra = capacity - len(self._ids)
+        self._ids = np.concatenate([self._ids, np.full(extra, -1, dtype=np.int64)])
+        self._vectors = np.concatenate([self._vectors, np.zeros((extra, self.dimensions), np.float32)])
+        self._neighbors = np.concatenate([self._neighbors, np.full((extra, self.k), -1, np.int64)])
+        self._scores = np.concatenate([self._scores, np.full((extra, self.k), -np.inf, np.float32)])
+
+    def _similarities(self, rows):
+        """Cossenos das linhas ``rows`` contra todas as receitas (a própria e as livres valem -inf)"""
+        scores = self._vectors[rows] @ self._vectors[:self._size].T
+        scores[np.arange(len(rows)), rows] = -np.inf
+        if self._free:
+            scores[:, self._free] = -np.inf
+        return scores
+
+    def _recompute(self, rows):
+        """Recalcula do zero os vizinhos de ``rows``, em lotes"""
+        for start in range(0, len(rows), BATCH_ROWS):
+            batch = rows[start:start + BATCH_ROWS]
+            self._set_top(batch, self._similarities(batch),
+                          np.broadcast_to(np.arange(self._size), (len(batch), self._size)))
+
+    def _set_top(self, rows, scores, candidates):
+        """Guarda os ``k`` maiores ``scores`` (com as linhas ``candidates``) de cada linha"""
+        keep = min(self.k, scores.shape[1])
+        if keep == 0:
+            return
+        top = np.argpartition(scores, scores.shape[1] - keep, axis=1)[:, -keep:]
+        top_scores = np.take_along_axis(scores, top, axis=1)
+        order = np.argsort(-top_scores, axis=1, kind="stable")
+        top = np.take_along_axis(top, order, axis=1)
+        top_scores = np.take_along_axis(top_scores, order, axis=1)
+        top_rows = np.take_along_axis(candidates, top, axis=1)
+        top_rows[np.isneginf(top_scores)] = -1
+        self._neighbors[rows, :keep] = top_rows
+        self._scores[rows, :keep] = top_scores
+        self._neighbors[rows, keep:] = -1
+        self._scores[rows, keep:] = -np.inf
+
+    def _rows_pointing_to(self, row):
+        return np.flatnonzero((self._neighbors[:self._size] == row).any(axis=1))
+
+    def _refresh(self, row):
+        """Atualiza a tabela depois que o vetor de ``row`` mudou.
+
+        As linhas que tinham ``row`` entre os vizinhos são recalculadas (a
+        similaridade pode ter caído); nas demais, ``row`` só entra se superar
+        o pior vizinho guardado.
+        """
+        affected = self._rows_pointing_to(row)
+        self._recompute(np.union1d(affected, [row]))
+
+        column = self._similarities(np.array([row]))[0]
+        column[affected] = -np.inf
+        better = np.flatnonzero(column > self._scores[:self._size, -1])
+        if len(better):
+            scores = np.column_stack([self._scores[better], column[better]])
+            candidates = np.column_stack([self._neighbors[better], np.full(len(better), row)])
+            self._set_top(better, scores, candidates)